@@ -4,16 +4,24 @@ Streamlit-based UI for YouTube Script Generator
 """
 
 import streamlit as st
+import numpy as np
+import io
 import os
 import json
+import logging
+import logging.handlers
+import queue
 import time
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 
-# Import our modules
+# Import our modules; the processing and generation modules are imported
+# lazily in the handlers that need them to keep cold starts fast
 from config import Config
-from transcript_processor import TranscriptProcessor, ProcessedTranscript
-from script_generator import ScriptGenerator
+
+if TYPE_CHECKING:
+    from transcript_processor import ProcessedTranscript
 
 # Page configuration
 st.set_page_config(
@@ -23,58 +31,260 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Name of the root QueueHandler installed by _configure_logging
+_LOG_HANDLER_NAME = "app-log-queue"
+
+@st.cache_resource
+def _configure_logging() -> "logging.handlers.QueueListener":
+    """Route log records through a queue so request threads never block on stream writes
+
+    Cached so Streamlit reruns skip it. When the cache is cleared (Clear cache,
+    or a code change in development) it runs again, so the handler and listener
+    from the previous run are removed and stopped first rather than stacked.
+    """
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if h.get_name() == _LOG_HANDLER_NAME]:
+        root.removeHandler(handler)
+        handler.listener.stop()
+    
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.set_name(_LOG_HANDLER_NAME)
+    queue_handler.listener = listener
+    
+    root.setLevel(Config.LOG_LEVEL)
+    root.addHandler(queue_handler)
+    listener.start()
+    return listener
+
+_configure_logging()
+
+log = logging.getLogger(__name__)
+
+STYLES_PATH = Path(__file__).with_name("styles.css")
+OUTPUT_DIR = Path("output")
+
+# Set once the output directory is known to exist, so saves skip the mkdir
+_OUTPUT_DIR_READY = False
+
+def _ensure_output_dir() -> Path:
+    """Create the output directory on first use"""
+    global _OUTPUT_DIR_READY
+    if not _OUTPUT_DIR_READY:
+        OUTPUT_DIR.mkdir(exist_ok=True)
+        _OUTPUT_DIR_READY = True
+    return OUTPUT_DIR
+
+# Actions offered under a generated script and in the editor; each set is one
+# radio plus a single dispatch button instead of a row of separate buttons
+SCRIPT_ACTIONS = ("📁 Save Script", "📊 Analyze Script", "✏️ Edit Script", "🔄 Generate Variation")
+EDITOR_ACTIONS = ("🔁 Recalculate Stats", "💾 Save Changes", "📊 Analyze Edited", "🔄 Reset to Original", "❌ Close Editor")
+
+# Metadata fields read by script analysis, with their fallbacks
+_ANALYSIS_DEFAULTS = (
+    ('length_minutes', 10),
+    ('tone_used', 'friendly_and_informative'),
+    ('target_audience', 'general_audience'),
+    ('content_type', 'general'),
+    ('creator_style', None),
+)
+
+# One score card in the script analysis header
+SCORE_CARD_TMPL = (
+    '<div style="flex:1; text-align: center; padding: 20px; background-color: {bg}; border-radius: 8px;">'
+    '<h3 style="color: {color}; margin: 0;">{title}</h3>'
+    '<h2 style="color: {color}; margin: 0;">{value}</h2>'
+    '<p style="margin: 5px 0 0 0;">{caption}</p>'
+    '</div>'
+)
+
+@st.cache_data(show_spinner=False)
+def _load_css() -> str:
+    """Read the custom stylesheet once and wrap it for st.markdown"""
+    return f"<style>\n{STYLES_PATH.read_text(encoding='utf-8')}</style>"
+
 # Custom CSS for better styling
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 3rem;
-        text-align: center;
-        color: #FF6B6B;
-        margin-bottom: 2rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    .creator-card {
-        border: 1px solid #ddd;
-        border-radius: 10px;
-        padding: 15px;
-        margin: 10px 0;
-        background-color: #f8f9fa;
-    }
-    
-    .generated-script {
-        background-color: #fff3cd;
-        border-left: 5px solid #ffc107;
-        padding: 15px;
-        margin: 10px 0;
-        border-radius: 5px;
-    }
-    
-    .metric-card {
-        background-color: #e7f3ff;
-        border-left: 5px solid #007bff;
-        padding: 10px;
-        margin: 5px 0;
-        border-radius: 5px;
-    }
-    
-    .success-message {
-        background-color: #d4edda;
-        border-left: 5px solid #28a745;
-        padding: 10px;
-        margin: 10px 0;
-        border-radius: 5px;
-    }
-    
-    .warning-message {
-        background-color: #fff3cd;
-        border-left: 5px solid #ffc107;
-        padding: 10px;
-        margin: 10px 0;
-        border-radius: 5px;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(_load_css(), unsafe_allow_html=True)
+
+# Column layout of the per-transcript metrics matrix
+METRIC_COLUMNS = (
+    'duration', 'word_count', 'hindi', 'english', 'mixed',
+    'enthusiasm', 'technical_depth', 'friendliness'
+)
+(COL_DURATION, COL_WORD_COUNT, COL_HINDI, COL_ENGLISH, COL_MIXED,
+ COL_ENTHUSIASM, COL_TECHNICAL, COL_FRIENDLINESS) = range(len(METRIC_COLUMNS))
+
+def _build_transcript_metrics(transcripts: List["ProcessedTranscript"]) -> np.ndarray:
+    """Stack the per-transcript numbers used by the analysis tab into an (N, 8) matrix"""
+    
+    return np.array([
+        [
+            t.metadata.duration,
+            t.metadata.word_count,
+            t.language_breakdown['hindi'],
+            t.language_breakdown['english'],
+            t.language_breakdown['mixed'],
+            t.tone_markers['enthusiasm'],
+            t.tone_markers['technical_depth'],
+            t.tone_markers['friendliness']
+        ]
+        for t in transcripts
+    ], dtype=np.float64).reshape(-1, len(METRIC_COLUMNS))
+
+# Corpus size above which the column reduction is handed to the numba kernel
+JIT_REDUCE_MIN_ROWS = 10_000
+
+# Compiled kernel, built on first use: numba takes far too long to import on every cold
+# start for a reduction only large corpora need. False once numba turned out to be missing.
+_reduce_metrics_jit = None
+# Replaced by numba.prange before the kernel is compiled
+_prange = range
+
+def _reduce_metrics(arr):
+    out = np.zeros(arr.shape[1])
+    for j in _prange(arr.shape[1]):
+        s = 0.0
+        for i in range(arr.shape[0]):
+            s += arr[i, j]
+        out[j] = s
+    return out
+
+def _metrics_jit_kernel():
+    """The numba-compiled _reduce_metrics, or None when numba is not installed"""
+    global _reduce_metrics_jit, _prange
+    if _reduce_metrics_jit is None:
+        try:
+            from numba import njit, prange
+        except ImportError:  # numba is optional; large corpora fall back to NumPy reductions
+            _reduce_metrics_jit = False
+        else:
+            _prange = prange
+            _reduce_metrics_jit = njit(parallel=True, cache=True)(_reduce_metrics)
+    return _reduce_metrics_jit or None
+
+def _metric_totals(metrics: np.ndarray) -> np.ndarray:
+    """Column sums of the metrics matrix, JIT-compiled for large corpora when numba is installed"""
+    
+    if metrics.shape[0] > JIT_REDUCE_MIN_ROWS:
+        kernel = _metrics_jit_kernel()
+        if kernel is not None:
+            return kernel(metrics)
+    return metrics.sum(axis=0)
+
+@st.cache_resource(show_spinner=False)
+def _load_transcripts(data_dir: str):
+    """Load and analyze transcripts once per server process"""
+    from transcript_processor import TranscriptProcessor
+    
+    processor = TranscriptProcessor(data_dir)
+    processed_transcripts = processor.load_all_transcripts()
+    
+    if not processed_transcripts:
+        raise ValueError("No transcripts could be loaded")
+    
+    return (
+        processed_transcripts,
+        processor.get_creator_summary(),
+        _build_transcript_metrics(processed_transcripts)
+    )
+
+@st.cache_resource(show_spinner=False)
+def _train_generator(data_dir: str, _transcripts: List["ProcessedTranscript"]):
+    """Train the script generator once per server process
+    
+    The transcripts argument is not hashed; the cache is keyed on data_dir,
+    which is what the transcripts were loaded from.
+    """
+    from script_generator import ScriptGenerator
+    
+    generator = ScriptGenerator()
+    training_summary = generator.train_on_transcripts(_transcripts)
+    
+    return generator, training_summary
+
+@st.cache_resource(show_spinner=False)
+def _get_validator():
+    """Shared ScriptValidator instance"""
+    from script_validator import ScriptValidator
+    return ScriptValidator()
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_validate(script: str, target_length: int, target_tone: str, target_audience: str,
+                     creator_style: Optional[str], content_type: str):
+    """Validate a script once per unique script text and target parameters"""
+    return _get_validator().validate_script(
+        script=script,
+        target_length_minutes=target_length,
+        target_tone=target_tone,
+        target_audience=target_audience,
+        creator_style=creator_style,
+        content_type=content_type
+    )
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _cached_language_mix(script: str) -> Dict:
+    """Language mix of a script, memoized on the script text"""
+    return _get_validator()._analyze_language_mix(script)
+
+_CREATOR_ROW_GETTER = itemgetter('video_count', 'total_duration', 'total_words')
+
+@st.cache_data(show_spinner=False)
+def _build_creator_rows(summary_items: tuple) -> tuple:
+    """Flatten creator summaries into (creator, videos, duration, words, hindi, english) rows"""
+    
+    return tuple(
+        (creator, *_CREATOR_ROW_GETTER(summary),
+         summary['language_mix']['hindi_ratio'], summary['language_mix']['english_ratio'])
+        for creator, summary in summary_items
+    )
+
+@st.cache_data(show_spinner=False)
+def _render_creator_cards(summary_items: tuple) -> str:
+    """Pre-format the creator breakdown cards as a single HTML block"""
+    
+    cards = []
+    for creator, video_count, total_duration, total_words, hindi_ratio, english_ratio in _build_creator_rows(summary_items):
+        cards.append(
+            f'<div class="creator-card">'
+            f'<h4>🎭 {creator}</h4>'
+            f"<p><strong>Videos:</strong> {video_count} | "
+            f"<strong>Total Duration:</strong> {total_duration // 60} min | "
+            f"<strong>Avg Words/Video:</strong> {total_words // video_count:,}</p>"
+            f"<p><strong>Language Mix:</strong> {hindi_ratio:.1%} Hindi, "
+            f"{english_ratio:.1%} English</p>"
+            f'</div>'
+        )
+    
+    return "".join(cards)
+
+@st.cache_data(show_spinner=False)
+def _render_creator_style_notes(summary_items: tuple) -> List[str]:
+    """Pre-format the keyword and style marker markdown, one block per creator"""
+    
+    notes = []
+    for creator, summary in summary_items:
+        parts = []
+        
+        if summary['common_keywords']:
+            keywords_str = ", ".join(summary['common_keywords'][:10])
+            parts.append(f"**🔑 Common Keywords**\n\n*{keywords_str}*")
+        
+        if summary['style_markers']:
+            markers_str = ", ".join(summary['style_markers'])
+            parts.append(f"**🎯 Style Markers**\n\n*{markers_str}*")
+        
+        notes.append("\n\n".join(parts))
+    
+    return notes
+
+@st.cache_data(show_spinner=False)
+def _quick_stats_strings(creator_count: int, transcript_count: int) -> Tuple[str, str, str]:
+    """Formatted sidebar quick stats: creators, transcripts, avg videos per creator"""
+    avg = f"{transcript_count / creator_count:.1f}" if creator_count else "0"
+    return str(creator_count), str(transcript_count), avg
 
 class YouTubeScriptGeneratorApp:
     """Main application class"""
@@ -92,6 +302,8 @@ class YouTubeScriptGeneratorApp:
             st.session_state.script_generator_trained = False
         if 'available_creators' not in st.session_state:
             st.session_state.available_creators = {}
+        if 'creator_options' not in st.session_state:
+            st.session_state.creator_options = ("Auto-select (best match)",)
         if 'training_summary' not in st.session_state:
             st.session_state.training_summary = {}
         if 'show_script_editor' not in st.session_state:
@@ -170,7 +382,6 @@ class YouTubeScriptGeneratorApp:
                         self.load_transcripts()
                         st.session_state.transcripts_loaded = True
                         st.success("✓ Transcripts loaded successfully!")
-                        st.rerun()
                     except Exception as e:
                         st.error(f"Error loading transcripts: {e}")
         else:
@@ -185,7 +396,6 @@ class YouTubeScriptGeneratorApp:
                         self.train_generator()
                         st.session_state.script_generator_trained = True
                         st.success("✓ Generator trained successfully!")
-                        st.rerun()
                     except Exception as e:
                         st.error(f"Error training generator: {e}")
         else:
@@ -198,45 +408,50 @@ class YouTubeScriptGeneratorApp:
             creator_count = len(st.session_state.available_creators)
             transcript_count = st.session_state.training_summary.get('total_transcripts', 0)
             
-            st.metric("Creators Analyzed", creator_count)
-            st.metric("Transcripts Processed", transcript_count)
+            creator_str, transcript_str, avg_str = _quick_stats_strings(creator_count, transcript_count)
+            
+            st.metric("Creators Analyzed", creator_str)
+            st.metric("Transcripts Processed", transcript_str)
             
             if creator_count > 0:
-                avg_videos_per_creator = transcript_count / creator_count
-                st.metric("Avg Videos/Creator", f"{avg_videos_per_creator:.1f}")
+                st.metric("Avg Videos/Creator", avg_str)
     
     def load_transcripts(self):
         """Load and process transcript data"""
         
-        processor = TranscriptProcessor(self.data_dir)
-        processed_transcripts = processor.load_all_transcripts()
-        
-        if not processed_transcripts:
-            raise ValueError("No transcripts could be loaded")
+        processed_transcripts, creator_summaries, transcript_metrics = _load_transcripts(self.data_dir)
         
         # Store in session state
         st.session_state.processed_transcripts = processed_transcripts
-        st.session_state.creator_summaries = processor.get_creator_summary()
-        st.session_state.available_creators = processor.get_creator_summary()
-        
-        print(f"Loaded {len(processed_transcripts)} transcripts")
+        st.session_state.creator_summaries = creator_summaries
+        st.session_state.available_creators = creator_summaries
+        # Selectbox options are fixed for a given load, so build them once
+        st.session_state.creator_options = ("Auto-select (best match)",) + tuple(creator_summaries.keys())
+        # Frozen view used as the cache key for the pre-rendered creator blocks
+        st.session_state.creator_summary_items = tuple(creator_summaries.items())
+        st.session_state.transcript_metrics = transcript_metrics
+        
+        log.info("Loaded %d transcripts", len(processed_transcripts))
     
     def train_generator(self):
         """Train the script generator"""
         
         processed_transcripts = st.session_state.processed_transcripts
         
-        generator = ScriptGenerator()
-        training_summary = generator.train_on_transcripts(processed_transcripts)
+        generator, training_summary = _train_generator(self.data_dir, processed_transcripts)
         
         # Store in session state
         st.session_state.script_generator = generator
         st.session_state.training_summary = training_summary
         
-        print(f"Training completed: {training_summary}")
+        log.info("Training completed: %s", training_summary)
     
+    @st.fragment
     def render_generation_tab(self):
-        """Render the main script generation interface"""
+        """Render the main script generation interface
+        
+        Runs as a fragment so form widget changes only rerun this tab.
+        """
         
         if not st.session_state.transcripts_loaded:
             st.info("👆 Please load transcripts first using the sidebar")
@@ -288,17 +503,16 @@ class YouTubeScriptGeneratorApp:
             st.subheader("🎭 Style Parameters")
             
             # Creator style
-            creator_options = ["Auto-select (best match)"] + list(st.session_state.available_creators.keys())
             creator_style = st.selectbox(
                 "Creator Style",
-                options=creator_options,
+                options=st.session_state.creator_options,
                 help="Choose which creators style to replicate"
             )
             
             # Tone
             tone = st.selectbox(
                 "Script Tone",
-                options=Config.VALID_TONES,
+                options=Config.VALID_TONES_ORDERED,
                 index=0,
                 help="Overall tone and energy level"
             )
@@ -306,7 +520,7 @@ class YouTubeScriptGeneratorApp:
             # Target audience
             target_audience = st.selectbox(
                 "Target Audience",
-                options=Config.VALID_AUDIENCES,
+                options=Config.VALID_AUDIENCES_ORDERED,
                 index=0,
                 help="Primary audience for the script"
             )
@@ -352,39 +566,57 @@ class YouTubeScriptGeneratorApp:
                 'additional_context': additional_context if additional_context else None
             }
             
-            # Show generation progress
-            progress_bar = st.progress(0)
             status_text = st.empty()
+            st.session_state.last_result = None
+            new_script = False
             
             try:
                 status_text.text("🔄 Generating script...")
-                progress_bar.progress(0.3)
                 
                 # Generate script
                 generator = st.session_state.script_generator
                 
-                # Update generation config if advanced options changed
-                generator.generation_config["temperature"] = temperature
+                # Show the draft as it streams in; the post-processed result is
+                # the return value of the stream once it is exhausted
+                outcome = {}
                 
-                result = generator.generate_script(
-                    **params,
-                    requested_word_cap=max_words,
-                    force_hinglish_ascii=force_hinglish_ascii,
-                )
+                def draft_chunks():
+                    outcome['result'] = yield from generator.stream_script(
+                        **params,
+                        requested_word_cap=max_words,
+                        force_hinglish_ascii=force_hinglish_ascii,
+                        temperature=temperature,
+                    )
+                
+                draft_placeholder = st.empty()
+                draft_placeholder.write_stream(draft_chunks())
+                draft_placeholder.empty()
+                result = outcome['result']
                 
-                progress_bar.progress(1.0)
                 status_text.text("✓ Script generated successfully!")
                 
-                # Display results
+                # Keep the result so it stays on screen when script actions rerun the tab
                 if result['success']:
-                    self.display_generated_script(result)
+                    st.session_state.last_result = result
+                    # Store the script for editing here; original kept for reset
+                    st.session_state.current_script = st.session_state.original_script = result['script']
+                    st.session_state.current_metadata = result['metadata']
+                    new_script = True
                 else:
                     st.error(f"Generation failed: {result.get('error', 'Unknown error')}")
                 
             except Exception as e:
-                progress_bar.progress(0)
                 status_text.text("❌ Generation failed")
                 st.error(f"Error generating script: {e}")
+            
+            # This tab is a fragment; rerun the whole app so the Script Editor tab
+            # picks up the new script (outside the try, as st.rerun raises to stop the run)
+            if new_script:
+                st.toast("✓ Script generated successfully!")
+                st.rerun(scope="app")
+        
+        if st.session_state.get('last_result'):
+            self.display_generated_script(st.session_state.last_result)
         
         # Examples section
         with st.expander("💡 Example Prompts"):
@@ -423,65 +655,44 @@ class YouTubeScriptGeneratorApp:
         metadata = result['metadata']
         script = result['script']
         
-        # Store script in session state for editing
-        st.session_state.current_script = script
-        st.session_state.current_metadata = metadata
-        st.session_state.original_script = script  # Store original for reset functionality
-        
-        # Metadata cards
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.markdown(f"""
-            <div class="metric-card">
-                <strong>⏱️ Duration:</strong><br>
-                {metadata['length_minutes']} minutes
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-            <div class="metric-card">
-                <strong>📝 Words:</strong><br>
-                {metadata['estimated_word_count']:,}
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown(f"""
-            <div class="metric-card">
-                <strong>🎭 Tone:</strong><br>
-                {metadata['tone_used']}
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            timing = result['timing_suggestions']
-            st.markdown(f"""
-            <div class="metric-card">
-                <strong>⚡ Gen Time:</strong><br>
-                {metadata['generation_time_seconds']}s
-            </div>
-            """, unsafe_allow_html=True)
+        # Metadata cards, rendered as one grid in a single markdown call
+        cards = [
+            ("⏱️ Duration:", f"{metadata['length_minutes']} minutes"),
+            ("📝 Words:", f"{metadata['estimated_word_count']:,}"),
+            ("🎭 Tone:", metadata['tone_used']),
+            ("⚡ Gen Time:", f"{metadata['generation_time_seconds']}s"),
+        ]
+        st.markdown(
+            '<div class="card-grid">'
+            + "".join(f'<div class="metric-card"><strong>{label}</strong><br>{value}</div>' for label, value in cards)
+            + '</div>',
+            unsafe_allow_html=True
+        )
+        
+        # Script actions
+        action_col, run_col = st.columns([4, 1])
+        
+        with action_col:
+            action = st.radio(
+                "Script action",
+                SCRIPT_ACTIONS,
+                horizontal=True,
+                label_visibility="collapsed",
+                key="script_action"
+            )
         
-        # Action buttons
-        col1, col2, col3, col4 = st.columns(4)
+        with run_col:
+            run_action = st.button("▶️ Run", key="run_script_action")
         
-        with col1:
-            if st.button("📁 Save Script", key="save_script_btn"):
+        if run_action:
+            if action == "📁 Save Script":
                 self.save_script_to_file(script, metadata)
-        
-        with col2:
-            if st.button("📊 Analyze Script", key="analyze_script_btn"):
+            elif action == "📊 Analyze Script":
                 self.analyze_script(script, metadata)
-        
-        with col3:
-            if st.button("✏️ Edit Script", key="edit_script_btn"):
+            elif action == "✏️ Edit Script":
                 st.session_state.show_script_editor = True
                 st.rerun()
-        
-        with col4:
-            if st.button("🔄 Generate Variation", key="variation_btn"):
+            else:
                 st.info("Use the generation form above with slight modifications for variation")
         
         # Script display with better formatting
@@ -508,14 +719,7 @@ class YouTubeScriptGeneratorApp:
         
         # Timing breakdown
         with st.expander("⏰ Timing Breakdown"):
-            timing_suggestions = result['timing_suggestions']
-            
-            st.markdown(f"""
-            - **Hook:** {timing_suggestions['hook_duration']}
-            - **Intro:** {timing_suggestions['intro_duration']}
-            - **CTA:** Around {timing_suggestions['cta_timing']}
-            - **Outro:** From {timing_suggestions['outro_timing']}
-            """)
+            st.markdown(result['timing_markdown'])
         
         # Applied patterns
         if 'creator_patterns_applied' in result and result['creator_patterns_applied']:
@@ -531,8 +735,12 @@ class YouTubeScriptGeneratorApp:
                     if patterns.get('engagement_phrases'):
                         st.write("**Engagement Phrases:**", ", ".join(patterns['engagement_phrases']))
     
+    @st.fragment
     def render_script_editor(self):
-        """Render the script editor interface"""
+        """Render the script editor interface
+        
+        Runs as a fragment so editor interactions do not rerun the other tabs.
+        """
         
         if 'current_script' not in st.session_state:
             st.warning("No script available for editing. Please generate a script first.")
@@ -541,71 +749,81 @@ class YouTubeScriptGeneratorApp:
         st.header("✏️ Script Editor")
         st.markdown("Edit your generated script and save changes in real-time.")
         
-        # Editor interface
-        col1, col2 = st.columns([3, 1])
-        
-        with col1:
-            # Text area for editing
-            edited_script = st.text_area(
-                "Edit Script",
-                value=st.session_state.current_script,
-                height=400,
-                help="Make your changes to the script here"
-            )
+        # Editor interface; stats and actions only run when the form is submitted,
+        # so typing in the text area does not rerun the app
+        with st.form("editor_form"):
+            col1, col2 = st.columns([3, 1])
             
-            # Update session state with edited script
-            st.session_state.current_script = edited_script
-        
-        with col2:
-            st.subheader("📊 Live Stats")
-            
-            # Calculate live metrics
-            word_count = len(edited_script.split())
-            char_count = len(edited_script)
-            estimated_minutes = word_count / 150  # Average speaking pace
-            
-            st.metric("Word Count", f"{word_count:,}")
-            st.metric("Characters", f"{char_count:,}")
-            from config import Config
-            estimated_minutes = word_count / Config.SPEECH_WPM
-            st.metric("Est. Duration", f"{estimated_minutes:.1f} min @ {Config.SPEECH_WPM} wpm")
-            
-            # Language mix analysis
-            if edited_script:
-                from script_validator import ScriptValidator
-                validator = ScriptValidator()
-                language_mix = validator._analyze_language_mix(edited_script)
+            with col1:
+                # Text area for editing
+                edited_script = st.text_area(
+                    "Edit Script",
+                    value=st.session_state.current_script,
+                    height=400,
+                    help="Make your changes to the script here"
+                )
                 
-                st.markdown("**Language Mix:**")
-                st.markdown(f"Hindi: {language_mix['hindi_ratio']:.1%}")
-                st.markdown(f"English: {language_mix['english_ratio']:.1%}")
-                st.markdown(f"Mixed: {language_mix['mixed_ratio']:.1%}")
-        
-        # Action buttons for editor
-        col1, col2, col3, col4 = st.columns(4)
+                # Update session state with edited script
+                st.session_state.current_script = edited_script
+            
+            with col2:
+                st.subheader("📊 Live Stats")
+                
+                # Calculate live metrics
+                word_count = len(edited_script.split())
+                char_count = len(edited_script)
+                estimated_minutes = word_count / 150  # Average speaking pace
+                
+                st.metric("Word Count", f"{word_count:,}")
+                st.metric("Characters", f"{char_count:,}")
+                from config import Config
+                estimated_minutes = word_count / Config.SPEECH_WPM
+                st.metric("Est. Duration", f"{estimated_minutes:.1f} min @ {Config.SPEECH_WPM} wpm")
+                
+                # Language mix analysis
+                if edited_script:
+                    language_mix = _cached_language_mix(edited_script)
+                    
+                    st.markdown("**Language Mix:**")
+                    st.markdown(f"Hindi: {language_mix['hindi_ratio']:.1%}")
+                    st.markdown(f"English: {language_mix['english_ratio']:.1%}")
+                    st.markdown(f"Mixed: {language_mix['mixed_ratio']:.1%}")
+            
+            # Editor actions
+            action_col, apply_col = st.columns([4, 1])
+            
+            with action_col:
+                action = st.radio(
+                    "Editor action",
+                    EDITOR_ACTIONS,
+                    horizontal=True,
+                    label_visibility="collapsed",
+                    key="editor_action"
+                )
+            
+            # Reset and close only touch session state, so they run in the
+            # submit callback before the next script run
+            with apply_col:
+                applied = st.form_submit_button("✅ Apply", on_click=self._apply_editor_action)
         
-        with col1:
-            if st.button("💾 Save Changes", key="save_edited_script"):
+        if applied:
+            if action == "💾 Save Changes":
                 self.save_script_to_file(edited_script, st.session_state.current_metadata)
-        
-        with col2:
-            if st.button("📊 Analyze Edited", key="analyze_edited_script"):
+            elif action == "📊 Analyze Edited":
                 self.analyze_script(edited_script, st.session_state.current_metadata)
         
-        with col3:
-            if st.button("🔄 Reset to Original", key="reset_script"):
-                st.session_state.current_script = st.session_state.original_script
-                st.rerun()
-        
-        with col4:
-            if st.button("❌ Close Editor", key="close_editor"):
-                st.session_state.show_script_editor = False
-                st.rerun()
-        
         # Show preview of edited script
         with st.expander("👀 Preview Edited Script"):
             st.markdown(edited_script.replace('\n', '\n\n'))
     
+    def _apply_editor_action(self):
+        """Editor callback: handle the actions that only change session state"""
+        action = st.session_state.editor_action
+        if action == "🔄 Reset to Original":
+            st.session_state.current_script = st.session_state.original_script
+        elif action == "❌ Close Editor":
+            st.session_state.show_script_editor = False
+    
     def render_analysis_tab(self):
         """Render the data analysis tab"""
         
@@ -618,6 +836,11 @@ class YouTubeScriptGeneratorApp:
         transcripts = st.session_state.processed_transcripts
         creator_summaries = st.session_state.creator_summaries
         
+        # Column totals and means over all transcripts in one reduction each
+        metrics = st.session_state.transcript_metrics
+        totals = _metric_totals(metrics)
+        means = totals / len(metrics)
+        
         # Overview metrics
         col1, col2, col3, col4 = st.columns(4)
         
@@ -630,41 +853,28 @@ class YouTubeScriptGeneratorApp:
             st.metric("Creators", creator_count)
         
         with col3:
-            avg_duration = sum(t.metadata.duration for t in transcripts) / len(transcripts) / 60
+            avg_duration = means[COL_DURATION] / 60
             st.metric("Avg Duration", f"{avg_duration:.1f} min")
         
         with col4:
-            total_words = sum(t.metadata.word_count for t in transcripts)
+            total_words = int(totals[COL_WORD_COUNT])
             st.metric("Total Words", f"{total_words:,}")
         
         # Creator breakdown
         st.subheader("🏆 Creator Breakdown")
         
-        for creator, summary in creator_summaries.items():
-            with st.container():
-                col1, col2 = st.columns([2, 1])
-                
-                with col1:
-                    st.markdown(f"""
-                    <div class="creator-card">
-                        <h4>🎭 {creator}</h4>
-                        <p><strong>Videos:</strong> {summary['video_count']} | 
-                        <strong>Total Duration:</strong> {summary['total_duration'] // 60} min</p>
-                        <p><strong>Language Mix:</strong> {summary['language_mix']['hindi_ratio']:.1%} Hindi, 
-                        {summary['language_mix']['english_ratio']:.1%} English</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col2:
-                    st.metric("Avg Words/Video", f"{summary['total_words'] // summary['video_count']:,}")
+        st.markdown(
+            _render_creator_cards(st.session_state.creator_summary_items),
+            unsafe_allow_html=True
+        )
         
         # Language analysis
         st.subheader("🗣️ Language Analysis")
         
         # Overall language distribution
-        hindi_total = sum(t.language_breakdown['hindi'] for t in transcripts)
-        english_total = sum(t.language_breakdown['english'] for t in transcripts)
-        mixed_total = sum(t.language_breakdown['mixed'] for t in transcripts)
+        hindi_total = totals[COL_HINDI]
+        english_total = totals[COL_ENGLISH]
+        mixed_total = totals[COL_MIXED]
         total_all = hindi_total + english_total + mixed_total
         
         if total_all > 0:
@@ -685,9 +895,9 @@ class YouTubeScriptGeneratorApp:
         # Tone analysis
         st.subheader("🎭 Tone Analysis")
         
-        avg_enthusiasm = sum(t.tone_markers['enthusiasm'] for t in transcripts) / len(transcripts)
-        avg_technical = sum(t.tone_markers['technical_depth'] for t in transcripts) / len(transcripts)
-        avg_friendly = sum(t.tone_markers['friendliness'] for t in transcripts) / len(transcripts)
+        avg_enthusiasm = means[COL_ENTHUSIASM]
+        avg_technical = means[COL_TECHNICAL]
+        avg_friendly = means[COL_FRIENDLINESS]
         
         col1, col2, col3 = st.columns(3)
         
@@ -709,9 +919,10 @@ class YouTubeScriptGeneratorApp:
         
         st.header("🎭 Creator Style Analysis")
         
-        creator_summaries = st.session_state.creator_summaries
+        summary_items = st.session_state.creator_summary_items
+        style_notes = _render_creator_style_notes(summary_items)
         
-        for creator, summary in creator_summaries.items():
+        for (creator, summary), notes in zip(summary_items, style_notes):
             st.subheader(f"📺 {creator}")
             
             col1, col2 = st.columns(2)
@@ -738,17 +949,9 @@ class YouTubeScriptGeneratorApp:
                 st.metric("English Ratio", f"{english_ratio:.1%}")
                 st.metric("Mixed Ratio", f"{mixed_ratio:.1%}")
             
-            # Common keywords
-            if summary['common_keywords']:
-                st.markdown("**🔑 Common Keywords**")
-                keywords_str = ", ".join(summary['common_keywords'][:10])
-                st.markdown(f"*{keywords_str}*")
-            
-            # Style markers
-            if summary['style_markers']:
-                st.markdown("**🎯 Style Markers**")
-                markers_str = ", ".join(summary['style_markers'])
-                st.markdown(f"*{markers_str}*")
+            # Common keywords and style markers
+            if notes:
+                st.markdown(notes)
             
             st.markdown("---")
     
@@ -780,11 +983,11 @@ class YouTubeScriptGeneratorApp:
         col1, col2 = st.columns(2)
         
         with col1:
-            for tone in Config.VALID_TONES[:4]:
+            for tone in Config.VALID_TONES_ORDERED[:4]:
                 st.markdown(f"• {tone}")
         
         with col2:
-            for tone in Config.VALID_TONES[4:]:
+            for tone in Config.VALID_TONES_ORDERED[4:]:
                 st.markdown(f"• {tone}")
         
         st.subheader("👥 Target Audiences")
@@ -792,11 +995,11 @@ class YouTubeScriptGeneratorApp:
         col1, col2 = st.columns(2)
         
         with col1:
-            for audience in Config.VALID_AUDIENCES[:4]:
+            for audience in Config.VALID_AUDIENCES_ORDERED[:4]:
                 st.markdown(f"• {audience}")
         
         with col2:
-            for audience in Config.VALID_AUDIENCES[4:]:
+            for audience in Config.VALID_AUDIENCES_ORDERED[4:]:
                 st.markdown(f"• {audience}")
         
         # Model information
@@ -827,24 +1030,26 @@ class YouTubeScriptGeneratorApp:
         """Save generated script to file"""
         
         # Create output directory if it doesn't exist
-        output_dir = Path("output")
-        output_dir.mkdir(exist_ok=True)
+        output_dir = _ensure_output_dir()
         
         # Generate filename
-        timestamp = int(time.time())
+        now = time.time()
+        timestamp = int(now)
         filename = f"script_{timestamp}.txt"
         filepath = output_dir / filename
         
-        # Save script with metadata
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"TOPIC: {metadata['topic']}\n")
-            f.write(f"DURATION: {metadata['length_minutes']} minutes\n")
-            f.write(f"TONE: {metadata['tone_used']}\n")
-            f.write(f"TARGET AUDIENCE: {metadata['target_audience']}\n")
-            f.write(f"CONTENT TYPE: {metadata['content_type']}\n")
-            f.write(f"CREATED: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 50 + "\n\n")
-            f.write(script)
+        # Save script with metadata; header lines and body are buffered in
+        # memory and written to disk in one go
+        buf = io.StringIO()
+        buf.write(f"TOPIC: {metadata['topic']}\n")
+        buf.write(f"DURATION: {metadata['length_minutes']} minutes\n")
+        buf.write(f"TONE: {metadata['tone_used']}\n")
+        buf.write(f"TARGET AUDIENCE: {metadata['target_audience']}\n")
+        buf.write(f"CONTENT TYPE: {metadata['content_type']}\n")
+        buf.write(f"CREATED: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))}\n")
+        buf.write("=" * 50 + "\n\n")
+        buf.write(script)
+        filepath.write_text(buf.getvalue(), encoding='utf-8')
         
         st.success(f"✓ Script saved to {filepath}")
     
@@ -856,27 +1061,15 @@ class YouTubeScriptGeneratorApp:
             return
         
         try:
-            from script_validator import ScriptValidator
-            
             # Get metadata or use defaults
-            if metadata is None:
-                metadata = st.session_state.get('current_metadata', {})
-            
-            target_length = metadata.get('length_minutes', 10)
-            target_tone = metadata.get('tone_used', 'friendly_and_informative')
-            target_audience = metadata.get('target_audience', 'general_audience')
-            content_type = metadata.get('content_type', 'general')
-            creator_style = metadata.get('creator_style', None)
-            
-            # Perform validation
-            validator = ScriptValidator()
-            validation_result = validator.validate_script(
-                script=script,
-                target_length_minutes=target_length,
-                target_tone=target_tone,
-                target_audience=target_audience,
-                creator_style=creator_style,
-                content_type=content_type
+            metadata = metadata or st.session_state.get('current_metadata') or {}
+            target_length, target_tone, target_audience, content_type, creator_style = (
+                metadata.get(key, default) for key, default in _ANALYSIS_DEFAULTS
+            )
+            
+            # Perform validation (cached per script and target parameters)
+            validation_result = _cached_validate(
+                script, target_length, target_tone, target_audience, creator_style, content_type
             )
             
             # Display analysis results
@@ -886,80 +1079,71 @@ class YouTubeScriptGeneratorApp:
             st.error(f"Error analyzing script: {e}")
             st.info("Make sure the script_validator module is properly installed")
     
+    @st.fragment
     def display_script_analysis(self, validation_result, metadata: Dict):
-        """Display detailed script analysis results"""
+        """Display detailed script analysis results
+        
+        Runs as a fragment so interacting with the report does not re-render
+        the analysis cards and metrics.
+        """
         
         st.markdown("---")
         st.header("📊 Script Analysis Results")
         
-        # Overall score
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            score_color = "green" if validation_result.overall_score >= 0.7 else "orange" if validation_result.overall_score >= 0.5 else "red"
-            st.markdown(f"""
-            <div style="text-align: center; padding: 20px; background-color: #f8f9fa; border-radius: 8px;">
-                <h3 style="color: {score_color}; margin: 0;">Overall Score</h3>
-                <h2 style="color: {score_color}; margin: 0;">{validation_result.overall_score:.2f}/1.0</h2>
-                <p style="margin: 5px 0 0 0;">{'Excellent' if validation_result.overall_score >= 0.8 else 'Good' if validation_result.overall_score >= 0.6 else 'Needs Improvement'}</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-            <div style="text-align: center; padding: 20px; background-color: #e7f3ff; border-radius: 8px;">
-                <h3 style="color: #007bff; margin: 0;">Authenticity</h3>
-                <h2 style="color: #007bff; margin: 0;">{validation_result.authenticity_score:.2f}/1.0</h2>
-                <p style="margin: 5px 0 0 0;">Hinglish Quality</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown(f"""
-            <div style="text-align: center; padding: 20px; background-color: #fff3cd; border-radius: 8px;">
-                <h3 style="color: #856404; margin: 0;">Readability</h3>
-                <h2 style="color: #856404; margin: 0;">{validation_result.readability_score:.1f}/100</h2>
-                <p style="margin: 5px 0 0 0;">Ease of Reading</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            status_color = "green" if validation_result.is_valid else "red"
-            status_text = "PASS" if validation_result.is_valid else "ISSUES"
-            st.markdown(f"""
-            <div style="text-align: center; padding: 20px; background-color: #f8f9fa; border-radius: 8px;">
-                <h3 style="color: {status_color}; margin: 0;">Status</h3>
-                <h2 style="color: {status_color}; margin: 0;">{status_text}</h2>
-                <p style="margin: 5px 0 0 0;">Validation</p>
-            </div>
-            """, unsafe_allow_html=True)
+        # Overall score cards, rendered as one markdown block
+        overall = validation_result.overall_score
+        score_color = "green" if overall >= 0.7 else "orange" if overall >= 0.5 else "red"
+        status_color = "green" if validation_result.is_valid else "red"
+        cards = (
+            {'bg': "#f8f9fa", 'color': score_color, 'title': "Overall Score",
+             'value': f"{overall:.2f}/1.0",
+             'caption': 'Excellent' if overall >= 0.8 else 'Good' if overall >= 0.6 else 'Needs Improvement'},
+            {'bg': "#e7f3ff", 'color': "#007bff", 'title': "Authenticity",
+             'value': f"{validation_result.authenticity_score:.2f}/1.0", 'caption': "Hinglish Quality"},
+            {'bg': "#fff3cd", 'color': "#856404", 'title': "Readability",
+             'value': f"{validation_result.readability_score:.1f}/100", 'caption': "Ease of Reading"},
+            {'bg': "#f8f9fa", 'color': status_color, 'title': "Status",
+             'value': "PASS" if validation_result.is_valid else "ISSUES", 'caption': "Validation"},
+        )
+        st.markdown(
+            "<div style='display:flex;gap:12px'>"
+            + "".join(SCORE_CARD_TMPL.format(**card) for card in cards)
+            + "</div>",
+            unsafe_allow_html=True
+        )
         
         # Detailed metrics
         st.subheader("📈 Detailed Metrics")
         
         metrics = validation_result.metrics
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("**Content Metrics:**")
-            st.write(f"• Word Count: {metrics['word_count']:,}")
-            st.write(f"• Characters: {metrics['char_count']:,}")
-            st.write(f"• Est. Duration: {metrics['estimated_minutes']:.1f} min")
-            st.write(f"• Target Duration: {metrics['target_minutes']} min")
-        
-        with col2:
-            st.markdown("**Language Analysis:**")
-            lang_mix = metrics['language_mix']
-            st.write(f"• Hindi: {lang_mix['hindi_ratio']:.1%}")
-            st.write(f"• English: {lang_mix['english_ratio']:.1%}")
-            st.write(f"• Mixed: {lang_mix['mixed_ratio']:.1%}")
-            st.write(f"• Structure Score: {metrics['structure_score']:.2f}/1.0")
-        
-        with col3:
-            st.markdown("**Quality Scores:**")
-            st.write(f"• Readability: {metrics['readability_score']:.1f}/100")
-            st.write(f"• Engagement: {metrics['engagement_score']}/10")
-            st.write(f"• Length Deviation: {metrics['length_deviation']:.1%}")
+        lang_mix = metrics['language_mix']
+        metric_groups = (
+            ("Content Metrics", (
+                ("Word Count", f"{metrics['word_count']:,}"),
+                ("Characters", f"{metrics['char_count']:,}"),
+                ("Est. Duration", f"{metrics['estimated_minutes']:.1f} min"),
+                ("Target Duration", f"{metrics['target_minutes']} min"),
+            )),
+            ("Language Analysis", (
+                ("Hindi", f"{lang_mix['hindi_ratio']:.1%}"),
+                ("English", f"{lang_mix['english_ratio']:.1%}"),
+                ("Mixed", f"{lang_mix['mixed_ratio']:.1%}"),
+                ("Structure Score", f"{metrics['structure_score']:.2f}/1.0"),
+            )),
+            ("Quality Scores", (
+                ("Readability", f"{metrics['readability_score']:.1f}/100"),
+                ("Engagement", f"{metrics['engagement_score']}/10"),
+                ("Length Deviation", f"{metrics['length_deviation']:.1%}"),
+            )),
+        )
+        
+        # One markdown table per group instead of a write call per metric
+        for col, (group, rows) in zip(st.columns(3), metric_groups):
+            with col:
+                st.markdown(
+                    f"| {group} | |\n|---|---|\n"
+                    + "\n".join(f"| {label} | {value} |" for label, value in rows)
+                )
         
         # Issues and warnings
         if validation_result.issues:
@@ -979,8 +1163,14 @@ class YouTubeScriptGeneratorApp:
                 st.info(f"• {suggestion}")
         
         # Generate and display quality report
+        self._render_quality_report(validation_result, metadata)
+    
+    @st.fragment
+    def _render_quality_report(self, validation_result, metadata: Dict):
+        """Quality report button and output, rerun on their own"""
+        
         if st.button("📋 Generate Quality Report", key="generate_report"):
-            report = validator.generate_quality_report(validation_result, metadata)
+            report = _get_validator().generate_quality_report(validation_result, metadata)
             
             st.subheader("📄 Quality Report")
             st.text_area("Full Quality Report", value=report, height=300, disabled=True)
@@ -998,6 +1188,7 @@ class YouTubeScriptGeneratorApp:
         
         if 'script_generator' in st.session_state:
             generator = st.session_state.script_generator
+            _ensure_output_dir()
             generator.save_training_context("output/training_context.json")
             st.success("✓ Training context exported to output/training_context.json")
         else:
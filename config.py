@@ -11,28 +11,50 @@ class Config:
     """Application configuration settings"""
     
     # API Configuration
+    # Checked by validate_config() (and when the generator is created), not at import time
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
     
-    if not GEMINI_API_KEY:
-        raise ValueError("GEMINI_API_KEY environment variable is required")
-    
     # Paths
     DATA_DIR = "Data/processed"
     OUTPUT_DIR = "output"
     
     # Application Settings
     DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
     NUM_TRANSCRIPTS_TO_LOAD = int(os.getenv('NUM_TRANSCRIPTS_TO_LOAD', '25'))
     MAX_SCRIPT_LENGTH_CHARS = int(os.getenv('MAX_SCRIPT_LENGTH_CHARS', '20000'))
     SPEECH_WPM = int(os.getenv('SPEECH_WPM', '140'))  # average Hindi speaking pace
     
+    # Generated script cache (exact parameter match, plus optional topic similarity when
+    # sentence-transformers is installed). Off by default: generation is sampled, so a
+    # cache hit returns the same script where users expect a fresh one on each Generate
+    SCRIPT_CACHE_ENABLED = os.getenv('SCRIPT_CACHE_ENABLED', 'False').lower() == 'true'
+    SCRIPT_CACHE_PATH = os.getenv('SCRIPT_CACHE_PATH', 'output/script_cache')
+    SCRIPT_CACHE_MAX_ENTRIES = int(os.getenv('SCRIPT_CACHE_MAX_ENTRIES', '1000'))
+    SCRIPT_CACHE_SEMANTIC = os.getenv('SCRIPT_CACHE_SEMANTIC', 'False').lower() == 'true'
+    SCRIPT_CACHE_SIMILARITY = float(os.getenv('SCRIPT_CACHE_SIMILARITY', '0.87'))
+    SCRIPT_CACHE_EMBEDDING_MODEL = os.getenv('SCRIPT_CACHE_EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
+    
+    # Gemini request handling
+    GEMINI_REQUEST_TIMEOUT = float(os.getenv('GEMINI_REQUEST_TIMEOUT', '12'))  # seconds to first chunk
+    GEMINI_REQUEST_ATTEMPTS = int(os.getenv('GEMINI_REQUEST_ATTEMPTS', '2'))
+    GEMINI_STREAM_CHUNK_TIMEOUT = float(os.getenv('GEMINI_STREAM_CHUNK_TIMEOUT', '20'))  # max seconds between chunks
+    # Output tokens per script word, used to size max_output_tokens (Hinglish in Latin script)
+    GEMINI_TOKENS_PER_WORD = float(os.getenv('GEMINI_TOKENS_PER_WORD', '1.3'))
+    GEMINI_MAX_CONCURRENT_REQUESTS = int(os.getenv('GEMINI_MAX_CONCURRENT_REQUESTS', '4'))
+    GEMINI_BATCH_POLL_SECONDS = int(os.getenv('GEMINI_BATCH_POLL_SECONDS', '10'))
+    GEMINI_BATCH_TIMEOUT_SECONDS = int(os.getenv('GEMINI_BATCH_TIMEOUT_SECONDS', '3600'))
+    
     # Default Script Parameters
     DEFAULT_TONE = os.getenv('DEFAULT_TONE', 'friendly_and_informative')
     DEFAULT_TARGET_AUDIENCE = os.getenv('DEFAULT_TARGET_AUDIENCE', 'tech_enthusiasts')
     DEFAULT_LENGTH_MINUTES = int(os.getenv('DEFAULT_LENGTH_MINUTES', '10'))
+    # "Auto-select (best match)" picks the trained creator whose tone profile fits the requested
+    # tone; off by default, where auto-select adds no creator context (the original behaviour)
+    AUTO_SELECT_CREATOR_BY_TONE = os.getenv('AUTO_SELECT_CREATOR_BY_TONE', 'False').lower() == 'true'
     
-    # Valid Tones
-    VALID_TONES = [
+    # Valid Tones (ordered for UI display; VALID_TONES for membership checks)
+    VALID_TONES_ORDERED = (
         'friendly_and_informative',
         'enthusiastic_and_energetic', 
         'professional_and_formal',
@@ -40,10 +62,11 @@ class Config:
         'dramatic_and_engaging',
         'technical_and_detailed',
         'humorous_and_entertaining'
-    ]
+    )
+    VALID_TONES = frozenset(VALID_TONES_ORDERED)
     
-    # Valid Target Audiences
-    VALID_AUDIENCES = [
+    # Valid Target Audiences (ordered for UI display; VALID_AUDIENCES for membership checks)
+    VALID_AUDIENCES_ORDERED = (
         'tech_enthusiasts',
         'general_audience',
         'beginners',
@@ -51,7 +74,8 @@ class Config:
         'students',
         'gamers',
         'content_creators'
-    ]
+    )
+    VALID_AUDIENCES = frozenset(VALID_AUDIENCES_ORDERED)
     
     # Supported Length Categories
     LENGTH_CATEGORIES = {
@@ -4,10 +4,44 @@ Demo Script for YouTube Script Generator
 Shows how to use the generator programmatically without the web UI
 """
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+
+# Only Config is imported eagerly; the processing, generation and validation
+# modules are imported by the helpers that first need them
 from config import Config
-from transcript_processor import TranscriptProcessor
-from script_generator import ScriptGenerator
-from script_validator import ScriptValidator
+
+def _preview(text: str, limit: int = 400) -> str:
+    """First `limit` characters of a script, cut back to the last word boundary"""
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(' ', 0, limit)
+    return text[:cut if cut > 0 else limit] + "..."
+
+@lru_cache(maxsize=1)
+def _get_validator():
+    """Shared validator instance for all demo runs"""
+    from script_validator import ScriptValidator
+    return ScriptValidator()
+
+@lru_cache(maxsize=1)
+def _load_transcripts(data_dir: str):
+    """Load transcripts once; both demos share the processor and results"""
+    from transcript_processor import TranscriptProcessor
+    processor = TranscriptProcessor(data_dir)
+    transcripts = processor.load_all_transcripts()
+    return processor, transcripts
+
+@lru_cache(maxsize=1)
+def _trained_generator(data_dir: str):
+    """Train the generator once on the cached transcripts"""
+    from script_generator import ScriptGenerator
+    _, transcripts = _load_transcripts(data_dir)
+    generator = ScriptGenerator()
+    training_summary = generator.train_on_transcripts(transcripts)
+    return generator, training_summary
 
 def demo_script_generation():
     """Demonstrate script generation capabilities"""
@@ -18,8 +52,7 @@ def demo_script_generation():
     try:
         # Step 1: Load and analyze transcripts
         print("📂 Loading transcript data...")
-        processor = TranscriptProcessor(Config.DATA_DIR)
-        transcripts = processor.load_all_transcripts()
+        processor, transcripts = _load_transcripts(Config.DATA_DIR)
         
         if not transcripts:
             print("❌ No transcripts found! Please ensure your data is in Data/processed/")
@@ -36,95 +69,72 @@ def demo_script_generation():
         
         # Step 2: Train script generator
         print("\n🧠 Training script generator...")
-        generator = ScriptGenerator()
-        training_summary = generator.train_on_transcripts(transcripts)
+        generator, training_summary = _trained_generator(Config.DATA_DIR)
         print(f"✅ Training completed: {training_summary['creators_analyzed']} creators analyzed")
         
         # Step 3: Generate some sample scripts
         print("\n📝 Generating sample scripts...")
         
-        # Example 1: Tech review
-        print("\n🔬 Example 1: Tech Review")
-        print("-" * 30)
+        samples = [
+            ("🔬 Example 1: Tech Review", dict(
+                topic="Samsung Galaxy S24 Ultra Camera Review",
+                length_minutes=8,
+                tone="enthusiastic_and_energetic", 
+                target_audience="tech_enthusiasts",
+                content_type="review",
+                additional_context="Focus on night photography and AI features"
+            )),
+            ("⚔️ Example 2: Comparison Video", dict(
+                topic="iPhone 15 Pro vs OnePlus 12 - Which is Better?",
+                length_minutes=10,
+                tone="technical_and_detailed",
+                target_audience="tech_enthusiasts", 
+                content_type="comparison",
+                additional_context="Compare performance, features, and value for money"
+            )),
+            ("🔧 Example 3: Tutorial", dict(
+                topic="How to Choose Perfect Gaming Phone in 2024",
+                length_minutes=6,
+                tone="friendly_and_informative",
+                target_audience="gamers",
+                content_type="tutorial",
+                additional_context="Step-by-step guide with key specifications to look for"
+            )),
+        ]
         
-        result1 = generator.generate_script(
-            topic="Samsung Galaxy S24 Ultra Camera Review",
-            length_minutes=8,
-            tone="enthusiastic_and_energetic", 
-            target_audience="tech_enthusiasts",
-            content_type="review",
-            additional_context="Focus on night photography and AI features"
-        )
+        # The samples are independent API calls, so request them concurrently
+        with ThreadPoolExecutor(max_workers=len(samples)) as executor:
+            results = list(executor.map(lambda sample: generator.generate_script(**sample[1]), samples))
         
-        if result1['success']:
-            print(f"✅ Generated: {result1['metadata']['estimated_word_count']} words, "
-                  f"{result1['metadata']['generation_time_seconds']}s")
-            print("\n📄 Preview:")
-            preview1 = result1['script'][:400] + "..." if len(result1['script']) > 400 else result1['script']
-            print(preview1)
+        for i, ((title, _), result) in enumerate(zip(samples, results)):
+            print(f"\n{title}")
+            print("-" * 30)
             
-            # Validate the script
-            validator = ScriptValidator()
-            validation = validator.validate_script(
-                result1['script'],
-                result1['metadata']['length_minutes'],
-                result1['metadata']['tone_used'],
-                result1['metadata']['target_audience'],
-                "review"
-            )
+            if not result['success']:
+                print(f"❌ Generation failed: {result.get('error')}")
+                continue
             
-            print(f"\n✅ Validation Score: {validation.overall_score:.2f}/1.0")
-            if validation.issues:
-                print("⚠️  Issues:", "; ".join(validation.issues[:2]))
-            if validation.suggestions:
-                print("💡 Suggestions:", "; ".join(validation.suggestions[:2]))
-        
-        else:
-            print(f"❌ Generation failed: {result1.get('error')}")
-        
-        # Example 2: Comparison video
-        print("\n⚔️ Example 2: Comparison Video")
-        print("-" * 30)
-        
-        result2 = generator.generate_script(
-            topic="iPhone 15 Pro vs OnePlus 12 - Which is Better?",
-            length_minutes=10,
-            tone="technical_and_detailed",
-            target_audience="tech_enthusiasts", 
-            content_type="comparison",
-            additional_context="Compare performance, features, and value for money"
-        )
-        
-        if result2['success']:
-            print(f"✅ Generated: {result2['metadata']['estimated_word_count']} words, "
-                  f"{result2['metadata']['generation_time_seconds']}s")
-            print("\n📄 Preview:")
-            preview2 = result2['script'][:400] + "..." if len(result2['script']) > 400 else result2['script']
-            print(preview2)
-        else:
-            print(f"❌ Generation failed: {result2.get('error')}")
-        
-        # Example 3: Tutorial
-        print("\n🔧 Example 3: Tutorial")
-        print("-" * 30)
-        
-        result3 = generator.generate_script(
-            topic="How to Choose Perfect Gaming Phone in 2024",
-            length_minutes=6,
-            tone="friendly_and_informative",
-            target_audience="gamers",
-            content_type="tutorial",
-            additional_context="Step-by-step guide with key specifications to look for"
-        )
-        
-        if result3['success']:
-            print(f"✅ Generated: {result3['metadata']['estimated_word_count']} words, "
-                  f"{result3['metadata']['generation_time_seconds']}s")
+            print(f"✅ Generated: {result['metadata']['estimated_word_count']} words, "
+                  f"{result['metadata']['generation_time_seconds']}s")
             print("\n📄 Preview:")
-            preview3 = result3['script'][:400] + "..." if len(result3['script']) > 400 else result3['script']
-            print(preview3)
-        else:
-            print(f"❌ Generation failed: {result3.get('error')}")
+            print(_preview(result['script']))
+            
+            # Validate the first script
+            if i == 0:
+                validator = _get_validator()
+                validation = validator.validate_script(
+                    result['script'],
+                    result['metadata']['length_minutes'],
+                    result['metadata']['tone_used'],
+                    result['metadata']['target_audience'],
+                    "review"
+                )
+                
+                print(f"\n✅ Validation Score: {validation.overall_score:.2f}/1.0")
+                if validation.issues:
+                    print("⚠️  Issues:", "; ".join(validation.issues[:2]))
+                if validation.suggestions:
+                    print("💡 Suggestions:", "; ".join(validation.suggestions[:2]))
         
         print("\n" + "=" * 50)
         print("🎉 Demo completed successfully!")
@@ -143,11 +153,8 @@ def demo_custom_generation():
     print("=" * 30)
     
     try:
-        # Initialize components
-        processor = TranscriptProcessor(Config.DATA_DIR)
-        transcripts = processor.load_all_transcripts()
-        generator = ScriptGenerator()
-        generator.train_on_transcripts(transcripts)
+        # Initialize components (reused from the first demo when it already ran)
+        generator, _ = _trained_generator(Config.DATA_DIR)
         
         # Custom scenarios
         scenarios = [
@@ -187,8 +194,8 @@ def demo_custom_generation():
                 print(f"👥 Audience: {result['metadata']['target_audience']}")
                 
                 # Show first paragraph
-                lines = result['script'].split('\n')
-                first_content = [l for l in lines if l.strip() and not l.startswith('[')][:3]
+                lines = result['script'].splitlines()
+                first_content = list(islice((l for l in lines if l.strip() and not l.startswith('[')), 3))
                 if first_content:
                     print("\n📝 Opening lines:")
                     for line in first_content:
@@ -198,7 +205,9 @@ def demo_custom_generation():
         print(f"❌ Custom demo failed: {e}")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=Config.LOG_LEVEL, format="%(levelname)s %(name)s: %(message)s")
     try:
+        Config.validate_config()
         demo_script_generation()
         
         # Ask if user wants custom demo
@@ -0,0 +1,178 @@
+"""
+Script Cache Module
+Reuses generated scripts for repeated or near-duplicate generation requests
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import shelve
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from config import Config
+
+log = logging.getLogger(__name__)
+
+class ScriptCache:
+    """Two-tier cache of generation results
+
+    Exact hits are looked up by a SHA-256 of the canonicalized request parameters.
+    Near-duplicate topics fall back to cosine similarity of sentence embeddings over
+    topic + additional context, only among entries whose other parameters match
+    exactly. Entries are kept in LRU order and persisted with shelve.
+    """
+
+    # Request parameters that describe the topic; everything else must match exactly
+    SEMANTIC_FIELDS = ('topic', 'additional_context')
+
+    def __init__(self,
+                 path: str = Config.SCRIPT_CACHE_PATH,
+                 max_entries: int = Config.SCRIPT_CACHE_MAX_ENTRIES,
+                 similarity_threshold: float = Config.SCRIPT_CACHE_SIMILARITY,
+                 semantic: bool = Config.SCRIPT_CACHE_SEMANTIC):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.semantic = semantic
+
+        # key -> {'shape': str, 'embedding': Optional[np.ndarray], 'result': Dict, 'stored_at': float}
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._encoder = None
+        self._lock = threading.Lock()
+
+        self._load()
+
+    def get(self, params: Dict) -> Tuple[Optional[Dict], Optional[np.ndarray]]:
+        """Cached result for these request parameters (None on a miss), and the topic
+        embedding computed for the lookup, to be handed back to put() on a miss"""
+        key = self._exact_key(params)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return copy.deepcopy(entry['result']), None
+
+        embedding = self._embed(params)
+        if embedding is None:
+            return None, None
+
+        shape = self._shape_key(params)
+        with self._lock:
+            candidates = [(k, e) for k, e in self._entries.items()
+                          if e['shape'] == shape and e['embedding'] is not None]
+            if not candidates:
+                return None, embedding
+
+            # Embeddings are unit-normalized, so one matmul gives all cosine similarities
+            matrix = np.stack([e['embedding'] for _, e in candidates])
+            scores = matrix @ embedding
+            best = int(np.argmax(scores))
+            if scores[best] < self.similarity_threshold:
+                return None, embedding
+
+            best_key, best_entry = candidates[best]
+            self._entries.move_to_end(best_key)
+            result = copy.deepcopy(best_entry['result'])
+
+        # A near-duplicate hit was generated for a different wording; report the requested topic
+        if 'metadata' in result:
+            result['metadata']['topic'] = params.get('topic')
+        return result, embedding
+
+    def put(self, params: Dict, result: Dict, embedding: Optional[np.ndarray] = None):
+        """Store a successful generation result (embedding: as returned by get, if available)"""
+        key = self._exact_key(params)
+        if embedding is None:
+            embedding = self._embed(params)
+        entry = {
+            'shape': self._shape_key(params),
+            'embedding': embedding,
+            'result': copy.deepcopy(result),
+            'stored_at': time.time()
+        }
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+
+            try:
+                with shelve.open(str(self.path)) as db:
+                    db[key] = entry
+                    for old_key in evicted:
+                        db.pop(old_key, None)
+            except Exception as e:
+                log.warning("Could not persist script cache: %s", e)
+
+    def clear(self):
+        """Drop all cached results, in memory and on disk"""
+        with self._lock:
+            self._entries.clear()
+            try:
+                with shelve.open(str(self.path), flag='n'):
+                    pass
+            except Exception as e:
+                log.warning("Could not clear script cache: %s", e)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self):
+        """Restore persisted entries, most recently stored last"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with shelve.open(str(self.path)) as db:
+                stored = sorted(db.items(), key=lambda item: item[1].get('stored_at', 0))
+        except Exception as e:
+            log.warning("Could not load script cache: %s", e)
+            return
+
+        for key, entry in stored[-self.max_entries:]:
+            self._entries[key] = entry
+
+    def _exact_key(self, params: Dict) -> str:
+        canonical = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _shape_key(self, params: Dict) -> str:
+        """Key over every parameter except the topic text"""
+        shape = {k: v for k, v in params.items() if k not in self.SEMANTIC_FIELDS}
+        return self._exact_key(shape)
+
+    def _embed(self, params: Dict) -> Optional[np.ndarray]:
+        """Unit-normalized embedding of the topic text; None when the semantic tier is off"""
+        encoder = self._get_encoder()
+        if encoder is None:
+            return None
+
+        text = " ".join(params.get(field) or "" for field in self.SEMANTIC_FIELDS).strip()
+        try:
+            return np.asarray(encoder.encode(text, normalize_embeddings=True), dtype=np.float32)
+        except Exception as e:
+            log.warning("Topic embedding failed: %s", e)
+            return None
+
+    def _get_encoder(self):
+        """Load the sentence embedding model on first use"""
+        if not self.semantic:
+            return None
+        if self._encoder is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+                self._encoder = SentenceTransformer(Config.SCRIPT_CACHE_EMBEDDING_MODEL)
+            except Exception as e:
+                # sentence-transformers is optional; keep the exact-match tier only
+                log.warning("Semantic script cache disabled: %s", e)
+                self.semantic = False
+                return None
+        return self._encoder
@@ -3,21 +3,361 @@ Script Generator Module
 Uses Google Gemini API to generate YouTube scripts based on transcript analysis
 """
 
-import google.generativeai as genai
-from typing import Dict, List, Optional, Tuple
+import asyncio
+import copy
+import dataclasses
+import re
+import sys
+import numpy as np
+import pandas as pd
+from typing import Dict, Generator, List, Optional, Tuple
 import json
-import tiktoken
-from typing import Dict
+import logging
+import os
+import queue
+import threading
 import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from functools import lru_cache
+from itertools import islice
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; training context save/load falls back to json
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; pattern detection falls back to substring checks
+    ahocorasick = None
+
+try:
+    import re2 as _cleanup_re
+except ImportError:  # google-re2 is optional; cleanup patterns use the standard re engine
+    _cleanup_re = re
+
 from config import Config
+from script_cache import ScriptCache
 from transcript_processor import ProcessedTranscript
 
+log = logging.getLogger(__name__)
+
+# Whitespace-delimited word
+_WORD_RE = re.compile(r'\S+')
+
+# Segment texts up to this length are interned while ranking intro/outro patterns
+_INTERN_MAX_LEN = 64
+
+# Item counts implied by a topic, e.g. "Top 5" or "5 laptops"
+_EXPECTED_ITEM_PATTERNS = (
+    re.compile(r"top\s+(\d+)", re.IGNORECASE),
+    re.compile(r"\b(\d+)\s*(?:items?|laptops?|phones?|mobiles?|tips?|points?)\b", re.IGNORECASE),
+)
+
+# Start of an enumerated item line: "1." / "2)" / "- " / "**Item 3**" / "Laptop 4:"
+_LIST_ITEM_RE = re.compile(
+    r"(?:\d+[\).]|[-*]\s|\*\*\s*\w+\s*\d+\s*\*\*|(?:laptop|phone|item)\s*\d+[:\-])",
+    re.IGNORECASE
+)
+
+# Whitespace that cleanup rewrites, matched in one pass: runs of three or more line breaks
+# (with any whitespace between) become a blank line; runs of spaces containing a tab, or of
+# two or more spaces, become a single space. Single spaces are left alone so they never match.
+# Compiled with RE2's linear-time engine when google-re2 is installed (\s is ASCII there).
+_WHITESPACE_FIX_RE = _cleanup_re.compile(r'\n\s*\n\s*\n|[ \t]*\t[ \t]*| {2,}')
+
+def _whitespace_replacement(match) -> str:
+    return '\n\n' if match.group()[0] == '\n' else ' '
+
+# Sentence-ending punctuation (including the Hindi danda '।' and '|' separators); followed
+# by whitespace it marks a place where a script can be cut
+_BOUNDARY_CHARS = frozenset('.!?|\u0964')
+
+# Punctuation a finished script may end with
+_END_CHARS = frozenset('.!?\u0964')
+
+# Script lines that start a section ("Hook:", "Introduction", "MAIN CONTENT", ...); a prefix
+# match like the old startswith check, so "Introduction" counts as "intro"
+_SECTION_HEADING_RE = re.compile(r"(?:hook|intro|main|conclusion|outro|cta)", re.IGNORECASE)
+
+def _json_default(obj):
+    """JSON fallback for the transcript dataclasses kept in creator_styles"""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+@lru_cache(maxsize=64)
+def _timing_suggestions(target_minutes: int) -> Dict[str, str]:
+    """Timing suggestions for a video length; treat the cached dict as read-only"""
+    total_seconds = target_minutes * 60
+    
+    return {
+        'hook_duration': '10-15 seconds',
+        'intro_duration': '15-20 seconds', 
+        'main_content_start': f'{25} seconds',
+        'cta_timing': f'{total_seconds - 30} seconds',
+        'outro_timing': f'{total_seconds - 15} seconds',
+        'total_target': f'{target_minutes} minutes'
+    }
+
+# Fixed sections of the generation prompt, filled in per request by _build_generation_prompt.
+# _SYSTEM_PROMPT is sent as the model's system instruction rather than in each prompt.
+_SYSTEM_PROMPT = """You are an expert YouTube script writer specializing in creating authentic Hinglish (Hindi + English mix) content for Indian tech channels. Create educational, informative, and family-friendly content about technology, gadgets, and reviews."""
+
+_CREATOR_CONTEXT_TEMPLATE = (
+    "\nCREATOR STYLE CONTEXT - Replicate the style of {creator}:\n"
+    "- Language preferences: {language_mix}\n"
+    "- Tone profile: {tone_profile}\n"
+    "- Content style: Natural conversational tone"
+)
+
+_REQUIREMENTS_TEMPLATE = """
+SCRIPT REQUIREMENTS:
+- Topic: {topic}
+- Duration: {length_minutes} minutes (approximately {approx_words} words)
+- Tone: {tone}
+- Target Audience: {target_audience}
+- Content Type: {content_type}
+
+IMPORTANT HARD LIMIT: Write no more than {hard_word_cap} words. Stop before exceeding this word cap. The script must be complete but concise.
+IMPORTANT: Generate a COMPLETE script from start to finish, but keep it within the word cap. Do not cut off mid-sentence. Include all sections: Hook, Introduction, Main Content, and Conclusion with Call-to-Action.
+"""
+
+_STYLE_TEMPLATE = """
+STYLE GUIDELINES:
+{tone_description}
+
+{content_guidelines}
+
+SCRIPT STRUCTURE:
+1. Hook (0-15 seconds): Engaging opening question or statement
+2. Intro (15-30 seconds): Channel greeting and video preview
+3. Main Content ({main_start}-{main_end} minutes): Core topic discussion
+4. Call-to-Action (15-30 seconds): Like, subscribe, notification bell
+5. Outro (15-30 seconds): Channel promotion and preview
+
+HINGLISH LANGUAGE PATTERNS:
+- Natural mix of Hindi and English
+- Common phrases: "दोस्तों", "भाई", "तो यहाँ पर", "सुनिए"
+- Technical terms in English, explanations in Hindi
+- Engaging expressions and enthusiasm markers
+"""
+
+# Zero-width characters, BOM and replacement characters stripped from model output.
+# Each code point is deleted individually, so runs of U+FFFD disappear along with single ones.
+_CLEAN_CHARS = ('\u200b', '\u200c', '\u200d', '\ufeff', '\ufffd')
+_CLEAN_TABLE = str.maketrans(dict.fromkeys(_CLEAN_CHARS))
+
+_CONTINUATION_INSTRUCTION = (
+    "Continue the script from where it stopped. Do not repeat any sentences. "
+    "Finish the remaining sections and end with a proper outro. "
+)
+
+_HINGLISH_ASCII_INSTRUCTION = "\nIMPORTANT: Write in Hinglish using Latin letters only (no Devanagari). Example: 'aap kya kar rahe ho', 'dosto', 'performance'. Keep it natural."
+
+_CLOSING_INSTRUCTIONS = "\n".join([
+    "\nGenerate an engaging, authentic YouTube script that sounds natural and conversational.",
+    "\nCRITICAL: Make sure to complete the entire script. Do not stop mid-sentence or leave sections incomplete. The script must be complete from beginning to end.",
+    "\nCOMPLETION REQUIREMENTS:\n- If the topic implies a list (e.g., \"Top 5 laptops\"), include exactly that many fully detailed items with consistent headings and balanced detail per item.\n- If you run out of room, compress wording rather than dropping items.\n- Ensure the script ends with a clear outro/CTA and a complete final sentence."
+])
+
+# Prompt guidelines per requested tone and content type
+_TONE_GUIDELINES = {
+    'friendly_and_informative': """
+- Use conversational tone
+- Include friendly greetings and transitions
+- Make technical concepts accessible
+- Ask rhetorical questions to engage audience
+""",
+    'enthusiastic_and_energetic': """
+- High energy language
+- Use enthusiastic expressions frequently
+- Create excitement about the topic
+- Include dramatic emphasis on key points
+""",
+    'professional_and_formal': """
+- More structured and formal language
+- Technical accuracy is paramount
+- Measured pace and tone
+- Professional vocabulary choices
+""",
+    'casual_and_conversational': """
+- Relaxed, everyday language
+- Use contractions and casual expressions
+- As if talking to a friend
+- Include personal opinions and reactions
+""",
+    'dramatic_and_engaging': """
+- Build suspense and excitement
+- Use dramatic words and expressions
+- Create a story-like narrative
+- Make the audience anticipate what comes next
+""",
+    'technical_and_detailed': """
+- Focus on specifications and technical details
+- Use precise technical vocabulary
+- Include comparisons and benchmarks
+- Detailed explanations of features
+""",
+    'humorous_and_entertaining': """
+- Include humor and jokes
+- Use wit and clever observations
+- Make the content entertaining
+- Balance information with entertainment
+"""
+}
+
+_CONTENT_TYPE_GUIDELINES = {
+    'review': """
+- Structure: Introduction -> Key Features -> Pros/Cons -> Performance -> Price Conclusion
+- Include comparisons with similar products
+- Cover practical usage scenarios
+- Provide clear recommendations
+""",
+    'comparison': """
+- Structure: Introduction -> Feature-by-feature comparison -> Performance comparison -> Value analysis -> Winner
+- Create fair comparisons
+- Highlight key differences
+- Provide clear winner with reasoning
+""",
+    'guide': """
+- Structure: Problem introduction -> Step-by-step solution -> Tips and tricks -> Summary
+- Clear instructions with actionable steps
+- Cover different scenarios
+- Include troubleshooting tips
+""",
+    'news': """
+- Structure: Breaking news -> Context and background -> Analysis -> Future implications
+- Start with the most important information
+- Provide context for viewers
+- Analyze implications and next steps
+""",
+    'general': """
+- Structure: Introduction -> Main content points -> Summary -> Conclusion
+- Balanced mix of information and entertainment
+- Engaging throughout the duration
+- Clear main message or takeaway
+"""
+}
+
+# Keywords reported by _extract_applied_patterns. Devanagari has no case, so the Hinglish
+# expressions are matched as is; engagement phrases are whole words, case-insensitive.
+_HINGLISH_EXPRESSIONS = ('दोस्तों', 'भाई', 'यार', 'सुनिए', 'देखिए', 'तो यहाँ पर')
+_ENGAGEMENT_PHRASES = ('subscribe', 'like', 'notification', 'bell', 'comment', 'share')
+# Whole words with their plural and past forms ("subscribers", "liked", "comments"),
+# so that "likely" is not counted as "like"; the group captures the base phrase
+_ENGAGEMENT_RE = re.compile(
+    r"\b(" + "|".join(_ENGAGEMENT_PHRASES) + r")(?:s|d|r|rs|ed)?\b", re.IGNORECASE
+)
+
+def _build_pattern_automaton():
+    """Aho-Corasick automaton over the Hinglish expressions, or None without pyahocorasick"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for expr in _HINGLISH_EXPRESSIONS:
+        automaton.add_word(expr, expr)
+    automaton.make_automaton()
+    return automaton
+
+_PATTERN_AUTOMATON = _build_pattern_automaton()
+
+# Creator tone profile dimensions, and the profile each selectable tone asks for.
+# The targets are hand-set from the tone names, not fitted to data: 1.0 marks the axis a
+# tone is about, around 0.5 a secondary one, 0.3 or less an axis it plays down. Creators
+# are matched by cosine similarity, so only the direction of a target matters, not its scale.
+# Used only when Config.AUTO_SELECT_CREATOR_BY_TONE is on.
+_TONE_AXES = ('enthusiasm', 'technical_depth', 'friendliness')
+_TONE_TARGETS = {
+    'friendly_and_informative': (0.5, 0.6, 1.0),
+    'enthusiastic_and_energetic': (1.0, 0.3, 0.5),
+    'professional_and_formal': (0.2, 1.0, 0.2),
+    'casual_and_conversational': (0.5, 0.2, 1.0),
+    'dramatic_and_engaging': (1.0, 0.2, 0.4),
+    'technical_and_detailed': (0.2, 1.0, 0.3),
+    'humorous_and_entertaining': (0.8, 0.1, 0.8),
+}
+
+# Creator-specific guideline blocks, keyed by a lowercase substring of the creator name
+_CREATOR_BLOCKS = {
+    'trakin': """
+- Use enthusiastic and energetic tone
+- Mix Hindi and English naturally (Hinglish)
+- Focus on smartphone reviews and comparisons
+- Include detailed specifications and pricing
+- Use expressions like "दोस्तों" frequently
+- Include call-to-action for likes and subscriptions
+- Structure: Hook intro -> Product overview -> Detailed review -> Pricing -> Conclusion
+""",
+    'techbar': """
+- Use friendly and informative tone
+- Provide comprehensive technical analysis
+- Longer form content structure
+- Professional yet approachable language style
+- Detailed comparisons and features breakdown
+- Include real-world usage scenarios
+""",
+}
+
+_DEFAULT_CREATOR_BLOCK = """
+- Maintain engaging tech content style
+- Mix conversational Hindi and English
+- Focus on technology reviews and guides
+- Include practical insights and comparisons
+"""
+
+# General style guidelines; each training context gets its own copy (see _create_style_guidelines)
+_STYLE_GUIDELINES = {
+    'hinglish_patterns': {
+        'common_transitions': ['अब देखते हैं', 'तो यहाँ पर', 'बात यह है कि', 'अब मुख्य बात'],
+        'engagement_phrases': ['दोस्तों', 'भाई', 'यार', 'आपको पता है', 'सुनने के लिए'],
+        'technical_mix': ['इसके में फीचर्स हैं', 'स्पेक्स देखिए', 'परफॉर्मेंस बहुत अच्छा है']
+    },
+    'script_structure': {
+        'hook': 'Start with engaging question or statement',
+        'intro': 'Brief intro with channel branding',
+        'main_content': 'Core review/content with logical flow',
+        'cta': 'Call to action for engagement',
+        'outro': 'Channel promotion and subscription reminder'
+    },
+    'content_types': {
+        'review': 'Focus on detailed analysis, pros/cons, recommendations',
+        'comparison': 'Side-by-side comparison with clear winner',
+        'unboxing': 'Step-by-step unboxing with reactions',
+        'tutorial': 'Clear instructions with visual cues',
+        'general': 'Balanced informative and entertaining content'
+    }
+}
+
 class ScriptGenerator:
     """Main script generation class using Gemini API"""
     
+    # Terminal states of a Gemini batch job
+    BATCH_DONE_STATES = frozenset({
+        'JOB_STATE_SUCCEEDED', 'JOB_STATE_FAILED', 'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED'
+    })
+    
+    # Upper bound on continuation requests per script
+    MAX_CONTINUATIONS = 3
+    
+    # Raw bytes of recently loaded training context files, keyed by (path, mtime_ns, size).
+    # Re-parsed on every hit so each load gets fresh objects; only the disk read is skipped.
+    _LOAD_CACHE: Dict[Tuple[str, int, int], bytes] = {}
+    _LOAD_CACHE_MAX_ENTRIES = 4
+    
     def __init__(self):
         """Initialize the script generator with Gemini configuration"""
         self.api_key = Config.GEMINI_API_KEY
+        if not self.api_key:
+            raise ValueError("GEMINI_API_KEY environment variable is required")
+        
+        # Imported here so importing this module (e.g. for its helpers) does not load the gRPC client
+        import google.generativeai as genai
+        from google.api_core import exceptions as google_exceptions
+        self._genai = genai
+        # Server-side failures worth sending the request again for; the call is over, so no double billing
+        self._retryable_errors = (google_exceptions.ServiceUnavailable, google_exceptions.InternalServerError)
         genai.configure(api_key=self.api_key)
         
         # Initialize Gemini models
@@ -48,23 +388,47 @@ class ScriptGenerator:
             }
         ]
         
+        self.model_name = 'gemini-2.5-flash'
+        # The fixed system prompt goes in as the system instruction, so it is not repeated in
+        # each prompt. Continuation requests carry it too. At about 50 tokens it is far below
+        # the minimum prefix size for Gemini's implicit caching, so nothing is cached from it.
         self.model = genai.GenerativeModel(
-            'gemini-2.5-flash',
-            safety_settings=self.safety_settings
+            self.model_name,
+            safety_settings=self.safety_settings,
+            system_instruction=_SYSTEM_PROMPT
         )
         
+        # Gemini calls in flight across all sessions (the generator is shared); a call's
+        # timeout only starts once it holds a slot, so time spent queueing is not counted
+        self._request_slots = threading.BoundedSemaphore(Config.GEMINI_MAX_CONCURRENT_REQUESTS)
+        
+        # Client for the batch API (google-genai), created on first batch request
+        self._batch_client = None
+        
         # Training data cache
         self.training_context = {}
         self.creator_styles = {}
+        self._creator_to_block: Dict[str, str] = {}
+        # Creator tone profiles as rows of a matrix (columns follow _TONE_AXES), for tone matching
+        self._creator_names: List[str] = []
+        self._tone_matrix = np.empty((0, len(_TONE_AXES)), dtype=np.float32)
+        self._creator_prompt_cache: Dict[Tuple[str, str], str] = {}
+        self._creator_context_cache: Dict[str, str] = {}
         
-        print("+ Script Generator initialized with Gemini API")
+        # Previously generated scripts, reused for repeated or near-duplicate requests
+        self.script_cache = ScriptCache() if Config.SCRIPT_CACHE_ENABLED else None
+        
+        log.info("Script generator initialized with Gemini model %s", self.model_name)
     
     def train_on_transcripts(self, processed_transcripts: List[ProcessedTranscript]) -> Dict[str, any]:
         """Train/initialize the system with transcript data"""
-        print("Training script generator on transcript data...")
+        log.info("Training script generator on %d transcripts", len(processed_transcripts))
         
         # Analyze creator styles
         self.creator_styles = self._analyze_creator_styles(processed_transcripts)
+        self._map_creator_blocks()
+        self._index_tone_profiles()
+        self._creator_context_cache.clear()
         
         # Create training prompts and examples
         self.training_context = self._create_training_context(processed_transcripts)
@@ -79,71 +443,116 @@ class ScriptGenerator:
             'sample_generation_success': sample_result['success']
         }
         
-        print(f"[OK] Training completed: {training_summary}")
+        log.info("Training completed: %s", training_summary)
         return training_summary
     
+    def _map_creator_blocks(self):
+        """Resolve each known creator's guideline block once"""
+        self._creator_to_block = {creator: self._match_creator_block(creator) for creator in self.creator_styles}
+    
+    def _index_tone_profiles(self):
+        """Stack the creators' tone profiles into unit-length rows of _tone_matrix"""
+        self._creator_names = list(self.creator_styles)
+        matrix = np.array(
+            [[data['tone_profile'][axis] for axis in _TONE_AXES] for data in self.creator_styles.values()],
+            dtype=np.float32
+        ).reshape(-1, len(_TONE_AXES))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self._tone_matrix = matrix / np.where(norms > 0, norms, 1)
+    
+    def find_closest_creator(self, target_vec) -> Optional[str]:
+        """Trained creator whose tone profile points closest to target_vec (enthusiasm, technical_depth, friendliness)"""
+        if not self._creator_names:
+            return None
+        scores = self._tone_matrix @ np.asarray(target_vec, dtype=np.float32)
+        return self._creator_names[int(np.argmax(scores))]
+    
+    def _auto_select_creator(self, tone: str) -> Optional[str]:
+        """Best-matching creator for a requested tone, or None if the tone has no profile
+        
+        Also None while Config.AUTO_SELECT_CREATOR_BY_TONE is off, so "Auto-select"
+        generates without creator context.
+        """
+        if not Config.AUTO_SELECT_CREATOR_BY_TONE:
+            return None
+        target_vec = _TONE_TARGETS.get(tone)
+        return self.find_closest_creator(target_vec) if target_vec is not None else None
+    
+    def _match_creator_block(self, creator: str) -> str:
+        """Guideline block for a creator name"""
+        name = creator.lower()
+        return next((block for key, block in _CREATOR_BLOCKS.items() if key in name), _DEFAULT_CREATOR_BLOCK)
+    
     def _analyze_creator_styles(self, transcripts: List[ProcessedTranscript]) -> Dict[str, Dict]:
         """Analyze and extract unique styles from each creator"""
-        creator_analysis = {}
+        if not transcripts:
+            return {}
         
-        for transcript in transcripts:
-            creator = transcript.metadata.uploader
-            
-            if creator not in creator_analysis:
-                creator_analysis[creator] = {
-                    'transcripts': [],
-                    'common_patterns': set(),
-                    'language_preferences': {'hindi_dominant': 0, 'english_dominant': 0, 'balanced': 0},
-                    'tone_profile': {'enthusiasm': 0, 'technical_depth': 0, 'friendliness': 0},
-                    'content_style': set(),
-                    'intro_patterns': [],
-                    'outro_patterns': []
-                }
-            
-            analysis = creator_analysis[creator]
-            analysis['transcripts'].append(transcript)
-            
-            # Analyze language preferences
-            lang_mix = transcript.language_breakdown
-            if lang_mix['hindi_ratio'] > 0.6:
-                analysis['language_preferences']['hindi_dominant'] += 1
-            elif lang_mix['english_ratio'] > 0.6:
-                analysis['language_preferences']['english_dominant'] += 1
-            else:
-                analysis['language_preferences']['balanced'] += 1
-            
-            # Analyze tone profile
-            for tone in ['enthusiasm', 'technical_depth', 'friendliness']:
-                analysis['tone_profile'][tone] += transcript.tone_markers[tone]
-            
-            # Extract style markers
-            analysis['content_style'].update(transcript.creator_style.get('style_markers', []))
-            
-            # Analyze intro/outro patterns
-            intro_segments = transcript.segments[:5]  # First 5 segments
-            outro_segments = transcript.segments[-5:]  # Last 5 segments
-            
-            analysis['intro_patterns'].extend([s['text'] for s in intro_segments if s.get('text')])
-            analysis['outro_patterns'].extend([s['text'] for s in outro_segments if s.get('text')])
+        tones = _TONE_AXES
         
-        # Normalize creator analysis
-        for creator, analysis in creator_analysis.items():
-            transcript_count = len(analysis['transcripts'])
-            
-            # Normalize tone profile
-            for tone in analysis['tone_profile']:
-                analysis['tone_profile'][tone] /= transcript_count
-            
-            # Convert sets to lists for serialization
-            analysis['common_patterns'] = list(analysis['common_patterns'])
-            analysis['content_style'] = list(analysis['content_style'])
-            
-            # Deduplicate patterns
-            analysis['intro_patterns'] = list(set(analysis['intro_patterns'][:10]))
-            analysis['outro_patterns'] = list(set(analysis['outro_patterns'][:10]))
+        # One row per transcript; per-creator aggregates are computed column-wise
+        df = pd.DataFrame({
+            'creator': [t.metadata.uploader for t in transcripts],
+            'hindi_ratio': [t.language_breakdown['hindi_ratio'] for t in transcripts],
+            'english_ratio': [t.language_breakdown['english_ratio'] for t in transcripts],
+            **{tone: [t.tone_markers[tone] for t in transcripts] for tone in tones}
+        })
+        df['language_preference'] = np.select(
+            [df['hindi_ratio'] > 0.6, df['english_ratio'] > 0.6],
+            ['hindi_dominant', 'english_dominant'],
+            default='balanced'
+        )
+        
+        grouped = df.groupby('creator', sort=False)
+        tone_means = grouped[list(tones)].mean()
+        preference_counts = df.groupby(['creator', 'language_preference'], sort=False).size()
+        
+        # Style markers and intro/outro texts (first/last 5 segments), ranked by
+        # how often each occurs for the creator
+        style_markers = self._rank_per_creator(
+            (t.metadata.uploader, marker) for t in transcripts
+            for marker in t.creator_style.get('style_markers', [])
+        )
+        intro_texts = self._rank_per_creator(
+            ((t.metadata.uploader, seg['text']) for t in transcripts
+             for seg in t.segments[:5] if seg.get('text')),
+            top=10
+        )
+        outro_texts = self._rank_per_creator(
+            ((t.metadata.uploader, seg['text']) for t in transcripts
+             for seg in t.segments[-5:] if seg.get('text')),
+            top=10
+        )
+        
+        creator_analysis = {}
+        positions = grouped.indices
+        for creator in df['creator'].unique():  # first-seen order
+            creator_analysis[creator] = {
+                'transcripts': [transcripts[i] for i in positions[creator]],
+                'common_patterns': [],
+                'language_preferences': {
+                    key: int(preference_counts.get((creator, key), 0))
+                    for key in ('hindi_dominant', 'english_dominant', 'balanced')
+                },
+                'tone_profile': {tone: float(tone_means.at[creator, tone]) for tone in tones},
+                'content_style': style_markers.get(creator, []),
+                'intro_patterns': intro_texts.get(creator, []),
+                'outro_patterns': outro_texts.get(creator, [])
+            }
         
         return creator_analysis
     
+    def _rank_per_creator(self, pairs, top: Optional[int] = None) -> Dict[str, List[str]]:
+        """Unique texts per creator from (creator, text) pairs, most frequent first"""
+        counters: Dict[str, Counter] = {}
+        for creator, text in pairs:
+            # Short openers/closers ("Hello dosto", "Subscribe") repeat across videos; share one copy
+            if len(text) <= _INTERN_MAX_LEN:
+                text = sys.intern(text)
+            counters.setdefault(creator, Counter())[text] += 1
+        # most_common keeps first-seen order among equally frequent texts
+        return {creator: [text for text, _ in counter.most_common(top)] for creator, counter in counters.items()}
+    
     def _create_training_context(self, transcripts: List[ProcessedTranscript]) -> Dict:
         """Create training context and examples for Gemini"""
         # Organize examples by creator and style
@@ -210,15 +619,30 @@ class ScriptGenerator:
         
         for creator, examples in examples_by_creator.items():
             if len(examples) > 0:
-                # Create creator-specific prompt
-                creator_prompt = self._create_creator_specific_prompt(creator, examples[0])
-                prompts.append(creator_prompt)
+                # Create creator-specific prompt (the prompt text itself is cached)
+                prompts.append(self._create_creator_specific_prompt(creator, examples[0]))
         
         return prompts
     
     def _create_creator_specific_prompt(self, creator: str, example: Dict) -> Dict:
         """Create a prompt specific to a creator's style"""
         
+        # The prompt text only depends on the creator and video length category
+        key = (creator, example['style_summary']['duration_category'])
+        prompt = self._creator_prompt_cache.get(key)
+        if prompt is None:
+            prompt = self._creator_prompt_cache[key] = self._render_creator_prompt(*key)
+        
+        return {
+            'creator': creator,
+            'type': 'creator_specific',
+            'prompt': prompt,
+            'example': example
+        }
+    
+    def _render_creator_prompt(self, creator: str, duration_category: str) -> str:
+        """Prompt text for a creator's style"""
+        
         # Base system prompt
         base_prompt = f"""You are generating YouTube scripts in the style of {creator}, a popular Hinglish (Hindi + English) tech YouTuber. 
 
@@ -226,32 +650,7 @@ Creator Style Guidelines for {creator}:
 """
         
         # Add creator-specific guidelines based on analysis
-        if 'trakin' in creator.lower():
-            base_prompt += """
-- Use enthusiastic and energetic tone
-- Mix Hindi and English naturally (Hinglish)
-- Focus on smartphone reviews and comparisons
-- Include detailed specifications and pricing
-- Use expressions like "दोस्तों" frequently
-- Include call-to-action for likes and subscriptions
-- Structure: Hook intro -> Product overview -> Detailed review -> Pricing -> Conclusion
-"""
-        elif 'techbar' in creator.lower():
-            base_prompt += """
-- Use friendly and informative tone
-- Provide comprehensive technical analysis
-- Longer form content structure
-- Professional yet approachable language style
-- Detailed comparisons and features breakdown
-- Include real-world usage scenarios
-"""
-        else:
-            base_prompt += """
-- Maintain engaging tech content style
-- Mix conversational Hindi and English
-- Focus on technology reviews and guides
-- Include practical insights and comparisons
-"""
+        base_prompt += self._creator_to_block.get(creator) or self._match_creator_block(creator)
         
         base_prompt += f"""
 
@@ -259,60 +658,37 @@ Generate authentic YouTube scripts that:
 1. Match {creator}'s speaking patterns and style
 2. Use appropriate Hinglish mix
 3. Include engaging elements like hooks, transitions, and CTAs
-4. Are structured for {example['style_summary']['duration_category']}-length videos
+4. Are structured for {duration_category}-length videos
 5. Capture the creator's unique voice and personality
 
 Remember: The script should sound like {creator} actually wrote and spoke it - authentic and natural."""
 
-        return {
-            'creator': creator,
-            'type': 'creator_specific',
-            'prompt': base_prompt,
-            'example': example
-        }
+        return base_prompt
     
     def _create_style_guidelines(self) -> Dict[str, str]:
         """Create general style guidelines for script generation"""
-        return {
-            'hinglish_patterns': {
-                'common_transitions': ['अब देखते हैं', 'तो यहाँ पर', 'बात यह है कि', 'अब मुख्य बात'],
-                'engagement_phrases': ['दोस्तों', 'भाई', 'यार', 'आपको पता है', 'सुनने के लिए'],
-                'technical_mix': ['इसके में फीचर्स हैं', 'स्पेक्स देखिए', 'परफॉर्मेंस बहुत अच्छा है']
-            },
-            'script_structure': {
-                'hook': 'Start with engaging question or statement',
-                'intro': 'Brief intro with channel branding',
-                'main_content': 'Core review/content with logical flow',
-                'cta': 'Call to action for engagement',
-                'outro': 'Channel promotion and subscription reminder'
-            },
-            'content_types': {
-                'review': 'Focus on detailed analysis, pros/cons, recommendations',
-                'comparison': 'Side-by-side comparison with clear winner',
-                'unboxing': 'Step-by-step unboxing with reactions',
-                'tutorial': 'Clear instructions with visual cues',
-                'general': 'Balanced informative and entertaining content'
-            }
-        }
+        # Deep-copied because the guidelines end up in the (mutable, exported) training context
+        # and hold nested dicts and lists; the copy is tiny and made once per training run
+        return copy.deepcopy(_STYLE_GUIDELINES)
     
     def _test_generation(self) -> Dict[str, any]:
         """Test generation capability with a sample prompt"""
         try:
             test_prompt = """Generate a 2-minute YouTube script intro for a smartphone review video in Hinglish style used by Indian tech YouTubers."""
             
-            response = self.model.generate_content(
-                test_prompt,
-                generation_config=self.generation_config
-            )
+            # Only the preview is used, so stop reading the stream once it is filled
+            sample_text = self._stream_text(test_prompt, self.generation_config, char_limit=200)
+            if not sample_text:
+                raise ValueError("No content generated")
             
             return {
                 'success': True,
-                'sample_length': len(response.text) if response.text else 0,
-                'response_preview': response.text[:200] if response.text else 'No content generated'
+                'sample_length': len(sample_text),
+                'response_preview': sample_text[:200]
             }
             
         except Exception as e:
-            print(f"Test generation failed: {e}")
+            log.exception("Test generation failed")
             return {
                 'success': False,
                 'error': str(e)
@@ -327,21 +703,83 @@ Remember: The script should sound like {creator} actually wrote and spoke it - a
                        creator_style: Optional[str] = None,
                        additional_context: Optional[str] = None,
                        requested_word_cap: Optional[int] = None,
-                       force_hinglish_ascii: bool = True) -> Dict[str, any]:
+                       force_hinglish_ascii: bool = True,
+                       temperature: Optional[float] = None) -> Dict[str, any]:
         """Generate a YouTube script based on parameters"""
         
-        print(f"Generating script: {topic} ({length_minutes} min, {tone}, {target_audience})")
+        stream = self.stream_script(
+            topic, length_minutes, tone, target_audience, content_type,
+            creator_style, additional_context, requested_word_cap, force_hinglish_ascii,
+            temperature
+        )
+        while True:
+            try:
+                next(stream)
+            except StopIteration as done:
+                return done.value
+    
+    async def agenerate_script(self, **params) -> Dict[str, any]:
+        """Async generate_script; takes the same keyword arguments
+        
+        Runs the blocking generation on a worker thread so several scripts can be
+        awaited together (see agenerate_scripts).
+        """
+        return await asyncio.to_thread(lambda: self.generate_script(**params))
+    
+    async def agenerate_scripts(self, requests: List[Dict]) -> List[Dict[str, any]]:
+        """Generate several scripts concurrently; results are in request order"""
+        return await asyncio.gather(*(self.agenerate_script(**params) for params in requests))
+    
+    def stream_script(self,
+                      topic: str,
+                      length_minutes: int,
+                      tone: str,
+                      target_audience: str,
+                      content_type: str,
+                      creator_style: Optional[str] = None,
+                      additional_context: Optional[str] = None,
+                      requested_word_cap: Optional[int] = None,
+                      force_hinglish_ascii: bool = True,
+                      temperature: Optional[float] = None) -> Generator[str, None, Dict[str, any]]:
+        """Generate a YouTube script, yielding the raw draft text as it streams in
+        
+        Yields text chunks of the first-pass draft. The generator's return value
+        is the same result dict that generate_script returns. temperature overrides
+        the default for this call only; the shared generation_config is not modified.
+        """
+        
+        log.info("Generating script: %s (%s min, %s, %s)", topic, length_minutes, tone, target_audience)
         
         try:
             start_time = time.time()
             
+            # "Auto-select": use the trained creator whose tone profile best fits the requested tone
+            if creator_style is None:
+                creator_style = self._auto_select_creator(tone)
+            
+            # Serve repeated or near-duplicate requests from the script cache
+            cache_params = {
+                'topic': topic,
+                'length_minutes': length_minutes,
+                'tone': tone,
+                'target_audience': target_audience,
+                'content_type': content_type,
+                'creator_style': creator_style,
+                'additional_context': additional_context,
+                'requested_word_cap': requested_word_cap,
+                'force_hinglish_ascii': force_hinglish_ascii,
+                'generation_config': self._call_generation_config(None, temperature)
+            }
+            topic_embedding = None
+            if self.script_cache is not None:
+                cached_result, topic_embedding = self.script_cache.get(cache_params)
+                if cached_result is not None:
+                    log.info("Reusing cached script")
+                    yield cached_result['script']
+                    return cached_result
+            
             # Determine hard word cap
-            default_target_words = max(150, int(length_minutes * 150))
-            if requested_word_cap and requested_word_cap > 0:
-                hard_word_cap = max(200, min(5000, int(requested_word_cap)))
-            else:
-                # Default: cap at min(target words, 2000)
-                hard_word_cap = min(2000, default_target_words)
+            hard_word_cap = self._resolve_word_cap(length_minutes, requested_word_cap)
             
             # Build prompt reflecting the exact cap
             prompt = self._build_generation_prompt(
@@ -350,32 +788,44 @@ Remember: The script should sound like {creator} actually wrote and spoke it - a
                 force_hinglish_ascii=force_hinglish_ascii
             )
 
-            # Compute a safe per-call token cap based on desired word count (~1.3 tokens/word)
-            approx_tokens = int(hard_word_cap * 1.3)  # rough tokens-per-word multiplier
-            call_generation_config = {**self.generation_config, "max_output_tokens": max(256, min(4096, approx_tokens))}
+            call_generation_config = self._call_generation_config(hard_word_cap, temperature)
             
-            # Try generation with full prompt first
-            response = self.model.generate_content(
-                prompt,
-                generation_config=call_generation_config
-            )
+            # Try generation with full prompt first, streaming the draft to the caller
+            try:
+                response = self._generate_with_timeout(prompt, call_generation_config, stream=True)
+            except TimeoutError as e:
+                log.warning("%s, trying with simpler prompt", e)
+                response = None
+            
+            # A stream that stalls part way keeps the text received so far; continuations fill the rest
+            draft_parts = []
+            stalled = False
+            if response is not None:
+                try:
+                    for chunk_text in self._iter_chunk_texts(response):
+                        draft_parts.append(chunk_text)
+                        yield chunk_text
+                except TimeoutError as e:
+                    log.warning("%s, keeping the partial draft", e)
+                    stalled = True
             
             generation_time = time.time() - start_time
             
-            # Check for safety issues
-            if not response.candidates:
+            # Check for safety issues (or a timed-out first attempt)
+            if response is None or (not stalled and not response.candidates):
                 # Try with a simpler, safer prompt
-                print("First attempt blocked, trying with simpler prompt...")
+                log.warning("First attempt failed, trying with simpler prompt")
                 simple_prompt = f"""Create a COMPLETE {length_minutes}-minute YouTube script about {topic} in Hinglish (Hindi + English mix). 
                 Make it educational, family-friendly, and suitable for tech enthusiasts. 
                 Include: Introduction, main content about {topic}, and conclusion with call-to-action.
                 Keep it professional and informative.
                 IMPORTANT: Generate the ENTIRE script from start to finish. Do not truncate or cut off mid-sentence."""
                 
-                response = self.model.generate_content(
-                    simple_prompt,
-                    generation_config=call_generation_config
-                )
+                # Streamed as well, so the request timeout bounds time to first chunk
+                response = self._generate_with_timeout(simple_prompt, call_generation_config, stream=True)
+                for chunk_text in self._iter_chunk_texts(response):
+                    yield chunk_text
+                generation_time = time.time() - start_time
                 
                 if not response.candidates or not response.text:
                     return {
@@ -384,23 +834,9 @@ Remember: The script should sound like {creator} actually wrote and spoke it - a
                         'metadata': {'topic': topic, 'length_minutes': length_minutes}
                     }
             
-            # Check safety ratings safely
-            if getattr(response, 'candidates', None):
-                candidate = response.candidates[0]
-                if getattr(candidate, 'safety_ratings', None):
-                    blocked_categories = []
-                    for rating in candidate.safety_ratings:
-                        if getattr(rating, 'probability', None) in ['HIGH', 'MEDIUM']:
-                            blocked_categories.append(f"{rating.category}: {rating.probability}")
-                    if blocked_categories:
-                        return {
-                            'success': False,
-                            'error': f'Content blocked by safety filters: {", ".join(blocked_categories)}. Try rephrasing your topic or context.',
-                            'metadata': {'topic': topic, 'length_minutes': length_minutes}
-                        }
-
-            # Extract text safely
-            script_text = self._extract_text_from_response(response)
+            # The safety_settings thresholds are enforced server-side: a blocked response
+            # simply carries no text, so that is the one check needed here
+            script_text = "".join(draft_parts) if stalled else self._response_text(response)
             if not script_text:
                 return {
                     'success': False,
@@ -408,54 +844,201 @@ Remember: The script should sound like {creator} actually wrote and spoke it - a
                     'metadata': {'topic': topic, 'length_minutes': length_minutes}
                 }
             
-            # Continuation if early stop or short vs cap
+            # Continuation if early stop or short vs cap; the word count is kept
+            # up to date as text is added instead of re-splitting the script
             accumulated_text = script_text
-            needs_more = len(accumulated_text.split()) < int(hard_word_cap * 0.85)
+            word_count = len(script_text.split())
+            needs_more = word_count < int(hard_word_cap * 0.85)
             expected_items = self._extract_expected_item_count(topic, additional_context)
             if expected_items:
                 current_items = self._count_list_items(accumulated_text)
                 if current_items < expected_items:
                     needs_more = True
             if needs_more:
-                # first generic continuation
-                accumulated_text = self._attempt_continuation(accumulated_text, hard_word_cap, call_generation_config)
-                # guided continuation for remaining items
-                if expected_items:
+                # Generic continuation first, then guided ones while list items are missing
+                guidance = ""
+                for _ in range(self.MAX_CONTINUATIONS):
+                    continued_text, word_count = self._continue(
+                        accumulated_text, word_count, hard_word_cap, call_generation_config, guidance
+                    )
+                    if continued_text is accumulated_text:
+                        break  # nothing added, or no word budget left
+                    accumulated_text = continued_text
+                    if not expected_items:
+                        break
                     current_items = self._count_list_items(accumulated_text)
-                    if current_items < expected_items and (hard_word_cap - len(accumulated_text.split())) > 60:
-                        guidance = f"Continue with items {current_items+1} to {expected_items}. Keep each item concise and balanced. Do not repeat. "
-                        accumulated_text = self._attempt_guided_continuation(accumulated_text, hard_word_cap, call_generation_config, guidance)
+                    if current_items >= expected_items or (hard_word_cap - word_count) <= 60:
+                        break
+                    guidance = f"Continue with items {current_items+1} to {expected_items}. Keep each item concise and balanced. Do not repeat. "
 
             # Clean and post-process the generated script
-            cleaned_text = self._clean_response_text(accumulated_text)
-            processed_script = self._post_process_script(cleaned_text, length_minutes, hard_word_cap)
+            result = self._build_result(
+                accumulated_text, topic, length_minutes, tone, target_audience,
+                content_type, creator_style, hard_word_cap, generation_time
+            )
             
-            return {
-                    'success': True,
-                    'script': processed_script['script'],
-                    'metadata': {
-                        'topic': topic,
-                        'length_minutes': length_minutes,
-                        'estimated_word_count': processed_script['word_count'],
-                        'estimated_speaking_time': processed_script['speaking_time'],
-                        'tone_used': tone,
-                        'target_audience': target_audience,
-                        'content_type': content_type,
-                        'creator_style_used': creator_style,
-                        'generation_time_seconds': round(generation_time, 2)
-                    },
-                    'timing_suggestions': processed_script['timing_suggestions'],
-                    'creator_patterns_applied': processed_script['pattern_markers']
-                }
+            if self.script_cache is not None:
+                self.script_cache.put(cache_params, result, topic_embedding)
+            
+            return result
                 
         except Exception as e:
-            print(f"Script generation failed: {e}")
+            log.exception("Script generation failed")
             return {
                 'success': False,
                 'error': str(e),
                 'metadata': {'topic': topic, 'length_minutes': length_minutes}
             }
     
+    def generate_scripts_batch(self, requests: List[Dict]) -> List[Dict[str, any]]:
+        """Generate several scripts through the Gemini batch API
+        
+        Each request holds the keyword arguments of generate_script. Batch jobs are
+        cheaper but not interactive, so this is meant for bulk, offline generation.
+        Results come back in request order. Uses the google-genai client (see
+        requirements.txt); if it cannot be imported or the job cannot be submitted,
+        falls back to concurrent generate_script calls.
+        
+        Batched results differ from generate_script: they are cleaned and
+        post-processed the same way, but
+        - the script cache is neither read nor written,
+        - short or incomplete drafts get no continuation calls,
+        - there is no per-request timeout/retry or simpler-prompt fallback; a failed
+          item comes back as an error result, and the whole job is bounded by
+          GEMINI_BATCH_TIMEOUT_SECONDS,
+        - generation_time_seconds is the wall time of the whole batch job.
+        """
+        if not requests:
+            return []
+        
+        try:
+            client = self._get_batch_client()
+        except Exception as e:
+            log.warning("Batch API unavailable (%s), generating interactively", e)
+            return self._generate_scripts_concurrently(requests)
+        
+        jobs = []
+        inline_requests = []
+        for params in requests:
+            params = {'creator_style': None, 'additional_context': None, 'requested_word_cap': None,
+                      'force_hinglish_ascii': True, 'temperature': None, **params}
+            if params['creator_style'] is None:
+                params['creator_style'] = self._auto_select_creator(params['tone'])
+            hard_word_cap = self._resolve_word_cap(params['length_minutes'], params['requested_word_cap'])
+            prompt = self._build_generation_prompt(
+                params['topic'], params['length_minutes'], params['tone'], params['target_audience'],
+                params['content_type'], params['creator_style'], params['additional_context'], hard_word_cap,
+                force_hinglish_ascii=params['force_hinglish_ascii']
+            )
+            jobs.append((params, hard_word_cap))
+            inline_requests.append({
+                'contents': [{'role': 'user', 'parts': [{'text': prompt}]}],
+                'config': {**self._call_generation_config(hard_word_cap, params['temperature']), 'safety_settings': self.safety_settings,
+                           'system_instruction': _SYSTEM_PROMPT}
+            })
+        
+        start_time = time.time()
+        try:
+            batch_job = client.batches.create(model=self.model_name, src=inline_requests)
+        except Exception as e:
+            log.warning("Batch submission failed (%s), generating interactively", e)
+            return self._generate_scripts_concurrently(requests)
+        
+        log.info("Submitted batch job %s with %d scripts", batch_job.name, len(inline_requests))
+        
+        # Poll until the job reaches a terminal state or we give up waiting
+        deadline = start_time + Config.GEMINI_BATCH_TIMEOUT_SECONDS
+        while batch_job.state.name not in self.BATCH_DONE_STATES:
+            if time.time() > deadline:
+                error = f'Batch job {batch_job.name} did not finish within {Config.GEMINI_BATCH_TIMEOUT_SECONDS}s'
+                return [self._error_result(error, params) for params, _ in jobs]
+            time.sleep(Config.GEMINI_BATCH_POLL_SECONDS)
+            batch_job = client.batches.get(name=batch_job.name)
+        
+        if batch_job.state.name != 'JOB_STATE_SUCCEEDED':
+            error = f'Batch job {batch_job.name} ended with {batch_job.state.name}'
+            return [self._error_result(error, params) for params, _ in jobs]
+        
+        generation_time = time.time() - start_time
+        results = []
+        for (params, hard_word_cap), inline_response in zip(jobs, batch_job.dest.inlined_responses):
+            text = None
+            if inline_response.response is not None:
+                text = self._extract_text_from_response(inline_response.response)
+            if not text:
+                error = str(inline_response.error) if inline_response.error else 'No text content generated.'
+                results.append(self._error_result(error, params))
+                continue
+            results.append(self._build_result(
+                text, params['topic'], params['length_minutes'], params['tone'], params['target_audience'],
+                params['content_type'], params['creator_style'], hard_word_cap, generation_time
+            ))
+        
+        return results
+    
+    def _get_batch_client(self):
+        """Create the google-genai client used for batch jobs on first use"""
+        if self._batch_client is None:
+            from google import genai as google_genai
+            self._batch_client = google_genai.Client(api_key=self.api_key)
+        return self._batch_client
+    
+    def _generate_scripts_concurrently(self, requests: List[Dict]) -> List[Dict[str, any]]:
+        """Fallback for generate_scripts_batch: interactive calls issued in parallel"""
+        with ThreadPoolExecutor(max_workers=min(len(requests), Config.GEMINI_MAX_CONCURRENT_REQUESTS)) as executor:
+            return list(executor.map(lambda params: self.generate_script(**params), requests))
+    
+    def _resolve_word_cap(self, length_minutes: int, requested_word_cap: Optional[int]) -> int:
+        """Hard word cap for a script: the requested cap, else min(target words, 2000)"""
+        if requested_word_cap and requested_word_cap > 0:
+            return max(200, min(5000, int(requested_word_cap)))
+        return min(2000, max(150, int(length_minutes * 150)))
+    
+    def _call_generation_config(self, hard_word_cap: Optional[int], temperature: Optional[float] = None) -> Dict:
+        """Per-call copy of the generation config: a safe output token cap for the word cap,
+        and the requested temperature (None keeps the default)"""
+        call_config = dict(self.generation_config)
+        if hard_word_cap is not None:
+            approx_tokens = int(hard_word_cap * Config.GEMINI_TOKENS_PER_WORD)
+            call_config["max_output_tokens"] = max(256, min(4096, approx_tokens))
+        if temperature is not None:
+            call_config["temperature"] = temperature
+        return call_config
+    
+    def _build_result(self, text: str, topic: str, length_minutes: int, tone: str, target_audience: str,
+                      content_type: str, creator_style: Optional[str], hard_word_cap: int,
+                      generation_time: float) -> Dict[str, any]:
+        """Clean and post-process generated text into the generate_script result dict"""
+        cleaned_text = self._clean_response_text(text)
+        processed_script = self._post_process_script(cleaned_text, length_minutes, hard_word_cap)
+        
+        return {
+            'success': True,
+            'script': processed_script['script'],
+            'metadata': {
+                'topic': topic,
+                'length_minutes': length_minutes,
+                'estimated_word_count': processed_script['word_count'],
+                'estimated_speaking_time': processed_script['speaking_time'],
+                'tone_used': tone,
+                'target_audience': target_audience,
+                'content_type': content_type,
+                'creator_style_used': creator_style,
+                'generation_time_seconds': round(generation_time, 2)
+            },
+            'timing_suggestions': processed_script['timing_suggestions'],
+            'timing_markdown': self._format_timing_markdown(processed_script['timing_suggestions']),
+            'creator_patterns_applied': processed_script['pattern_markers']
+        }
+    
+    def _error_result(self, error: str, params: Dict) -> Dict[str, any]:
+        """Failed generation result for a request"""
+        return {
+            'success': False,
+            'error': error,
+            'metadata': {'topic': params['topic'], 'length_minutes': params['length_minutes']}
+        }
+    
     def _build_generation_prompt(self, 
                                 topic: str, 
                                 length_minutes: int, 
@@ -466,73 +1049,52 @@ Remember: The script should sound like {creator} actually wrote and spoke it - a
                                 additional_context: Optional[str],
                                 hard_word_cap: Optional[int] = None,
                                 force_hinglish_ascii: bool = True) -> str:
-        """Build comprehensive prompt for script generation"""
+        """Build the per-request part of the generation prompt (the system prompt is set on the model)"""
         
-        # Base prompt structure
         prompt_parts = []
         
-        # System context
-        prompt_parts.append("""You are an expert YouTube script writer specializing in creating authentic Hinglish (Hindi + English mix) content for Indian tech channels. Create educational, informative, and family-friendly content about technology, gadgets, and reviews.""")
-        
         # Style context from creator analysis
         if creator_style and creator_style in self.creator_styles:
-            creator_data = self.creator_styles[creator_style]
-            prompt_parts.append(f"\nCREATOR STYLE CONTEXT - Replicate the style of {creator_style}:")
-            prompt_parts.append(f"- Language preferences: {self._get_language_mix_description(creator_data)}")
-            prompt_parts.append(f"- Tone profile: {self._get_tone_description(creator_data)}")
-            prompt_parts.append(f"- Content style: Natural conversational tone")
-        
-        # Main instruction
-        target_words = max(150, int(length_minutes * 150))
-        if hard_word_cap is None:
-            hard_word_cap = min(2000, target_words)
-        prompt_parts.append(f"""
-SCRIPT REQUIREMENTS:
-- Topic: {topic}
-- Duration: {length_minutes} minutes (approximately {length_minutes * Config.SPEECH_WPM} words)
-- Tone: {tone}
-- Target Audience: {target_audience}
-- Content Type: {content_type}
-
-IMPORTANT HARD LIMIT: Write no more than {hard_word_cap} words. Stop before exceeding this word cap. The script must be complete but concise.
-IMPORTANT: Generate a COMPLETE script from start to finish, but keep it within the word cap. Do not cut off mid-sentence. Include all sections: Hook, Introduction, Main Content, and Conclusion with Call-to-Action.
-""")
-        
-        # Style guidelines
-        tone_description = self._get_tone_guidelines(tone)
-        content_guidelines = self._get_content_type_guidelines(content_type)
+            prompt_parts.append(self._creator_context(creator_style))
         
-        prompt_parts.append(f"""
-STYLE GUIDELINES:
-{tone_description}
-
-{content_guidelines}
-
-SCRIPT STRUCTURE:
-1. Hook (0-15 seconds): Engaging opening question or statement
-2. Intro (15-30 seconds): Channel greeting and video preview
-3. Main Content ({length_minutes - 1}-{length_minutes - 0.5} minutes): Core topic discussion
-4. Call-to-Action (15-30 seconds): Like, subscribe, notification bell
-5. Outro (15-30 seconds): Channel promotion and preview
-
-HINGLISH LANGUAGE PATTERNS:
-- Natural mix of Hindi and English
-- Common phrases: "दोस्तों", "भाई", "तो यहाँ पर", "सुनिए"
-- Technical terms in English, explanations in Hindi
-- Engaging expressions and enthusiasm markers
-""")
+        # Main instruction and style guidelines
+        if hard_word_cap is None:
+            hard_word_cap = min(2000, max(150, int(length_minutes * 150)))
+        prompt_parts.append(_REQUIREMENTS_TEMPLATE.format(
+            topic=topic,
+            length_minutes=length_minutes,
+            approx_words=length_minutes * Config.SPEECH_WPM,
+            tone=tone,
+            target_audience=target_audience,
+            content_type=content_type,
+            hard_word_cap=hard_word_cap
+        ))
+        prompt_parts.append(_STYLE_TEMPLATE.format(
+            tone_description=self._get_tone_guidelines(tone),
+            content_guidelines=self._get_content_type_guidelines(content_type),
+            main_start=length_minutes - 1,
+            main_end=length_minutes - 0.5
+        ))
         
         if additional_context:
             prompt_parts.append(f"\nADDITIONAL CONTEXT:\n{additional_context}")
         
         if force_hinglish_ascii:
-            prompt_parts.append("\nIMPORTANT: Write in Hinglish using Latin letters only (no Devanagari). Example: 'aap kya kar rahe ho', 'dosto', 'performance'. Keep it natural.")
-        prompt_parts.append("\nGenerate an engaging, authentic YouTube script that sounds natural and conversational.")
-        prompt_parts.append("\nCRITICAL: Make sure to complete the entire script. Do not stop mid-sentence or leave sections incomplete. The script must be complete from beginning to end.")
-        prompt_parts.append("\nCOMPLETION REQUIREMENTS:\n- If the topic implies a list (e.g., \"Top 5 laptops\"), include exactly that many fully detailed items with consistent headings and balanced detail per item.\n- If you run out of room, compress wording rather than dropping items.\n- Ensure the script ends with a clear outro/CTA and a complete final sentence.")
+            prompt_parts.append(_HINGLISH_ASCII_INSTRUCTION)
+        prompt_parts.append(_CLOSING_INSTRUCTIONS)
         
         return "\n".join(prompt_parts)
 
+    def _response_text(self, response) -> Optional[str]:
+        """Text of the first candidate, read in a single walk over its parts"""
+        candidates = getattr(response, 'candidates', None)
+        if candidates:
+            content = getattr(candidates[0], 'content', None)
+            parts_text = [p.text for p in (getattr(content, 'parts', None) or ()) if getattr(p, 'text', None)]
+            # A blocked candidate has no text parts; report that as no text
+            return "".join(parts_text) or None  # same joining as response.text
+        return self._extract_text_from_response(response)
+    
     def _extract_text_from_response(self, response) -> Optional[str]:
         """Safely extract text from a Gemini response without triggering quick-accessor errors."""
         # Try quick accessor
@@ -564,102 +1126,182 @@ HINGLISH LANGUAGE PATTERNS:
         except Exception:
             return None
 
-    def _attempt_continuation(self, current_text: str, hard_word_cap: int, generation_config: Dict) -> str:
-        """If the model stopped early, request continuation until cap/outro reached."""
+    def _extract_chunk_text(self, chunk) -> Optional[str]:
+        """Text of a single streamed chunk; None for chunks without text parts (e.g. blocked)"""
         try:
-            remaining_words = max(0, hard_word_cap - len(current_text.split()))
-            if remaining_words < 50:
-                return current_text
-            tail = " ".join(current_text.split()[-80:])
-            continuation_prompt = (
-                f"Continue the script from where it stopped. Do not repeat any sentences. "
-                f"Finish the remaining sections and end with a proper outro. "
-                f"You have approximately {remaining_words} words remaining (total cap {hard_word_cap}). "
-                f"Here are the last lines to continue from:\n" + tail
-            )
-            more = self.model.generate_content(continuation_prompt, generation_config=generation_config)
-            if more and getattr(more, 'text', None):
-                combined = current_text.rstrip() + "\n\n" + more.text.strip()
-                return self._truncate_to_words_sentence_aware(combined, hard_word_cap)
+            return chunk.text
         except Exception:
-            return current_text
-        return current_text
+            return None
 
-    def _attempt_guided_continuation(self, current_text: str, hard_word_cap: int, generation_config: Dict, guidance: str) -> str:
-        """Continuation with guidance for remaining list items."""
+    def _start_request(self, prompt: str, generation_config: Dict, stream: bool) -> Future:
+        """Run generate_content on its own thread once a request slot is free"""
+        self._request_slots.acquire()
+        future = Future()
+        
+        def run():
+            try:
+                future.set_result(self.model.generate_content(prompt, generation_config=generation_config, stream=stream))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                self._request_slots.release()
+        
+        threading.Thread(target=run, name="gemini-request", daemon=True).start()
+        return future
+
+    def _generate_with_timeout(self, prompt: str, generation_config: Dict, stream: bool = False,
+                               timeout: Optional[float] = None, max_attempts: Optional[int] = None):
+        """Call generate_content with a wall-clock timeout
+        
+        For streamed calls the timeout bounds the wait for the first chunk, counted from
+        when the request is sent. A call that times out is still running (and billed),
+        so the next attempt keeps waiting on it instead of sending a duplicate; only a
+        call that failed with a transient server error is sent again. Raises
+        TimeoutError once every attempt is used up, so the total wait stays below
+        max_attempts * timeout.
+        """
+        timeout = timeout or Config.GEMINI_REQUEST_TIMEOUT
+        max_attempts = max_attempts or Config.GEMINI_REQUEST_ATTEMPTS
+        
+        future = None
+        for attempt in range(1, max_attempts + 1):
+            if future is None:
+                future = self._start_request(prompt, generation_config, stream)
+            try:
+                return future.result(timeout=timeout)
+            except FuturesTimeoutError:
+                log.warning("Gemini request timed out after %ss (attempt %d/%d)", timeout, attempt, max_attempts)
+            except self._retryable_errors as e:
+                if attempt == max_attempts:
+                    raise
+                log.warning("Gemini request failed (attempt %d/%d): %s", attempt, max_attempts, e)
+                future = None
+        
+        # The abandoned call finishes in the background; its result is dropped
+        raise TimeoutError(f"Gemini request timed out after {max_attempts} attempts")
+
+    def _iter_chunk_texts(self, response, timeout: Optional[float] = None) -> Generator[str, None, None]:
+        """Yield the text of each streamed chunk, raising TimeoutError if the stream stalls
+        
+        The stream is read on a helper thread so the wait for each chunk can be bounded
+        (GEMINI_STREAM_CHUNK_TIMEOUT seconds). After a stall the response is incomplete.
+        """
+        timeout = timeout or Config.GEMINI_STREAM_CHUNK_TIMEOUT
+        chunks = queue.Queue()
+        done = object()
+        
+        def pump():
+            try:
+                for chunk in response:
+                    chunks.put(chunk)
+            except BaseException as e:
+                chunks.put(e)
+            chunks.put(done)
+        
+        threading.Thread(target=pump, name="gemini-stream", daemon=True).start()
+        while True:
+            try:
+                chunk = chunks.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError(f"Gemini stream stalled for {timeout}s")
+            if chunk is done:
+                return
+            if isinstance(chunk, BaseException):
+                raise chunk
+            chunk_text = self._extract_chunk_text(chunk)
+            if chunk_text:
+                yield chunk_text
+
+    def _stream_text(self, prompt: str, generation_config: Dict,
+                     word_limit: Optional[int] = None, char_limit: Optional[int] = None) -> str:
+        """Stream a generation and return its text, stopping once either limit is reached"""
+        parts = []
+        words = chars = 0
+        response = self._generate_with_timeout(prompt, generation_config, stream=True)
         try:
-            remaining_words = max(0, hard_word_cap - len(current_text.split()))
+            for chunk_text in self._iter_chunk_texts(response):
+                parts.append(chunk_text)
+                words += len(chunk_text.split())
+                chars += len(chunk_text)
+                if (word_limit is not None and words >= word_limit) or (char_limit is not None and chars >= char_limit):
+                    break
+        except TimeoutError as e:
+            log.warning("%s, keeping the text received so far", e)
+        return "".join(parts)
+
+    def _continue(self, current_text: str, word_count: int, hard_word_cap: int,
+                  generation_config: Dict, guidance: str = "") -> Tuple[str, int]:
+        """Request a continuation of the script, optionally guided (e.g. towards remaining list items)
+        
+        Returns the extended text and its word count; the same text object comes back
+        when nothing was added.
+        """
+        try:
+            remaining_words = max(0, hard_word_cap - word_count)
             if remaining_words < 50:
-                return current_text
-            tail = " ".join(current_text.split()[-80:])
+                return current_text, word_count
+            tail = " ".join(current_text.rsplit(None, 80)[-80:])
             continuation_prompt = (
-                guidance +
+                (guidance or _CONTINUATION_INSTRUCTION) +
                 f"You have approximately {remaining_words} words remaining (total cap {hard_word_cap}). "
                 f"Here are the last lines to continue from:\n" + tail
             )
-            more = self.model.generate_content(continuation_prompt, generation_config=generation_config)
-            if more and getattr(more, 'text', None):
-                combined = current_text.rstrip() + "\n\n" + more.text.strip()
-                return self._truncate_to_words_sentence_aware(combined, hard_word_cap)
+            # Anything past the remaining budget would be truncated anyway
+            more_text = self._stream_text(continuation_prompt, generation_config, word_limit=remaining_words)
+            if more_text.strip():
+                combined = current_text.rstrip() + "\n\n" + more_text.strip()
+                return self._cap_words(combined, word_count + len(more_text.split()), hard_word_cap)
         except Exception:
-            return current_text
-        return current_text
+            return current_text, word_count
+        return current_text, word_count
 
     def _extract_expected_item_count(self, topic: str, additional_context: Optional[str]) -> Optional[int]:
         """Extract expected item count from topic/context (e.g., 'Top 5', '5 laptops')."""
-        import re
         text = " ".join([t for t in [topic, additional_context] if t])
-        patterns = [r"top\s+(\d+)", r"\b(\d+)\s*(?:items?|laptops?|phones?|mobiles?|tips?|points?)\b"]
-        candidates = []
-        for pat in patterns:
-            for m in re.findall(pat, text, flags=re.IGNORECASE):
-                try:
-                    candidates.append(int(m))
-                except Exception:
-                    pass
+        candidates = [int(m) for pattern in _EXPECTED_ITEM_PATTERNS for m in pattern.findall(text)]
         return max(candidates) if candidates else None
 
     def _count_list_items(self, text: str) -> int:
         """Heuristic count of enumerated items in the current script."""
-        import re
-        lines = [ln.strip() for ln in text.split('\n')]
-        count = 0
-        for ln in lines:
-            if re.match(r"^(?:\d+[\).]|[-*]\s)\s*", ln):
-                count += 1
-            elif re.match(r"^\*\*\s*\w+\s*\d+\s*\*\*", ln):
-                count += 1
-            elif re.match(r"^(?:laptop|phone|item)\s*\d+[:\-]", ln, flags=re.IGNORECASE):
-                count += 1
-        return count
+        return sum(1 for ln in text.split('\n') if _LIST_ITEM_RE.match(ln.strip()))
     
     def _clean_response_text(self, text: str) -> str:
         """Clean and fix encoding issues in the response text"""
-        import re
-        
-        # First, try to decode and re-encode to fix encoding issues
+        # Lone surrogates are the only thing a UTF-8 round trip would drop; skip the copy otherwise
         try:
-            # Remove any replacement characters and fix common encoding issues
-            cleaned_text = text.encode('utf-8', errors='ignore').decode('utf-8')
-        except:
+            text.encode('utf-8')
             cleaned_text = text
+        except UnicodeEncodeError:
+            cleaned_text = text.encode('utf-8', errors='ignore').decode('utf-8')
         
-        # Remove problematic Unicode characters that cause display issues
-        cleaned_text = re.sub(r'[\u200B-\u200D\uFEFF]', '', cleaned_text)  # Remove zero-width characters
+        # Remove zero-width and replacement characters that cause display issues
         # IMPORTANT: Do NOT collapse spaces between Devanagari characters; that destroys word boundaries.
+        if any(ch in cleaned_text for ch in _CLEAN_CHARS):
+            cleaned_text = cleaned_text.translate(_CLEAN_TABLE)
         
-        # Remove any remaining replacement characters
-        cleaned_text = re.sub(r'\uFFFD+', '', cleaned_text)
-        
-        # Clean up excessive whitespace
-        cleaned_text = re.sub(r'\n\s*\n\s*\n', '\n\n', cleaned_text)  # Remove excessive line breaks
-        cleaned_text = re.sub(r'[ \t]+', ' ', cleaned_text)  # Normalize spaces
+        # Collapse excessive line breaks and normalize spaces in a single pass
+        cleaned_text = _WHITESPACE_FIX_RE.sub(_whitespace_replacement, cleaned_text)
         
-        # Ensure proper line breaks
-        cleaned_text = cleaned_text.replace('\r\n', '\n').replace('\r', '\n')
+        # Ensure proper line breaks; model output rarely has any carriage returns, so one
+        # scan usually settles it. ('\r\n' must become a single '\n', which is why this is
+        # not a one-character translate.)
+        if '\r' in cleaned_text:
+            cleaned_text = cleaned_text.replace('\r\n', '\n').replace('\r', '\n')
         
         return cleaned_text
     
+    def _creator_context(self, creator: str) -> str:
+        """Creator style section of the prompt, rendered once per creator per training run"""
+        context = self._creator_context_cache.get(creator)
+        if context is None:
+            creator_data = self.creator_styles[creator]
+            context = self._creator_context_cache[creator] = _CREATOR_CONTEXT_TEMPLATE.format(
+                creator=creator,
+                language_mix=self._get_language_mix_description(creator_data),
+                tone_profile=self._get_tone_description(creator_data)
+            )
+        return context
+    
     def _get_language_mix_description(self, creator_data: Dict) -> str:
         """Get language mix description for creator"""
         pref = creator_data.get('language_preferences', {})
@@ -687,123 +1329,42 @@ HINGLISH LANGUAGE PATTERNS:
     
     def _get_tone_guidelines(self, tone: str) -> str:
         """Get specific guidelines for requested tone"""
-        tone_guidelines = {
-            'friendly_and_informative': """
-- Use conversational tone
-- Include friendly greetings and transitions
-- Make technical concepts accessible
-- Ask rhetorical questions to engage audience
-""",
-            'enthusiastic_and_energetic': """
-- High energy language
-- Use enthusiastic expressions frequently
-- Create excitement about the topic
-- Include dramatic emphasis on key points
-""",
-            'professional_and_formal': """
-- More structured and formal language
-- Technical accuracy is paramount
-- Measured pace and tone
-- Professional vocabulary choices
-""",
-            'casual_and_conversational': """
-- Relaxed, everyday language
-- Use contractions and casual expressions
-- As if talking to a friend
-- Include personal opinions and reactions
-""",
-            'dramatic_and_engaging': """
-- Build suspense and excitement
-- Use dramatic words and expressions
-- Create a story-like narrative
-- Make the audience anticipate what comes next
-""",
-            'technical_and_detailed': """
-- Focus on specifications and technical details
-- Use precise technical vocabulary
-- Include comparisons and benchmarks
-- Detailed explanations of features
-""",
-            'humorous_and_entertaining': """
-- Include humor and jokes
-- Use wit and clever observations
-- Make the content entertaining
-- Balance information with entertainment
-"""
-        }
-        
-        return tone_guidelines.get(tone, tone_guidelines['friendly_and_informative'])
+        return _TONE_GUIDELINES.get(tone, _TONE_GUIDELINES['friendly_and_informative'])
     
     def _get_content_type_guidelines(self, content_type: str) -> str:
         """Get guidelines for specific content types"""
-        content_guidelines = {
-            'review': """
-- Structure: Introduction -> Key Features -> Pros/Cons -> Performance -> Price Conclusion
-- Include comparisons with similar products
-- Cover practical usage scenarios
-- Provide clear recommendations
-""",
-            'comparison': """
-- Structure: Introduction -> Feature-by-feature comparison -> Performance comparison -> Value analysis -> Winner
-- Create fair comparisons
-- Highlight key differences
-- Provide clear winner with reasoning
-""",
-            'guide': """
-- Structure: Problem introduction -> Step-by-step solution -> Tips and tricks -> Summary
-- Clear instructions with actionable steps
-- Cover different scenarios
-- Include troubleshooting tips
-""",
-            'news': """
-- Structure: Breaking news -> Context and background -> Analysis -> Future implications
-- Start with the most important information
-- Provide context for viewers
-- Analyze implications and next steps
-""",
-            'general': """
-- Structure: Introduction -> Main content points -> Summary -> Conclusion
-- Balanced mix of information and entertainment
-- Engaging throughout the duration
-- Clear main message or takeaway
-"""
-        }
-        
-        return content_guidelines.get(content_type, content_guidelines['general'])
+        return _CONTENT_TYPE_GUIDELINES.get(content_type, _CONTENT_TYPE_GUIDELINES['general'])
     
     def _post_process_script(self, raw_script: str, target_minutes: int, hard_word_cap: int) -> Dict[str, any]:
         """Post-process the generated script for formatting, enforce hard limits, and ensure a clean ending"""
         
-        # Clean and format the script
-        lines = raw_script.split('\n')
-        cleaned_lines = [line.strip() for line in lines if line.strip()]
-        
         formatted_script = []
         current_section = "Introduction"
+        word_count = 0
         
-        # Parse and reformat sections
-        for line in cleaned_lines:
-            if line.lower().startswith(('hook', 'intro', 'main', 'conclusion', 'outro', 'cta')):
-                current_section = line.strip()
+        # Clean and reformat the script line by line (blank lines dropped), counting words as we go
+        for line in raw_script.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            word_count += len(line.split())
+            if _SECTION_HEADING_RE.match(line):
+                current_section = line
                 formatted_script.append(f"\n[{current_section.upper()}]\n")
             else:
                 formatted_script.append(line)
         
         script_text = "\n".join(formatted_script)
         
-        # Enforce word cap with sentence-aware truncation
-        script_text = self._truncate_to_words_sentence_aware(script_text, hard_word_cap)
+        # Enforce word cap with sentence-aware truncation (skipped when already under the cap)
+        script_text, word_count = self._cap_words(script_text, word_count, hard_word_cap)
         
-        # Ensure the script ends at a sentence boundary; do not force a canned outro
+        # Ensure the script ends at a sentence boundary; do not force a canned outro.
+        # At most a period is appended, which does not change the word count.
         script_text = self._ensure_sentence_boundary(script_text)
         
-        # Estimate word count and speaking time
-        word_count = len(script_text.split())
-        estimated_minutes = word_count / 150  # Average 150 words per minute
-        
-        # Adjust if too long/short
-        if estimated_minutes > target_minutes * 1.2:
-            estimated_minutes = round(word_count / 150, 1)
+        # Estimate speaking time
+        estimated_minutes = round(word_count / 150, 1)  # Average 150 words per minute
         
         # Create timing suggestions
         timing_suggestions = self._create_timing_suggestions(target_minutes)
@@ -816,22 +1377,35 @@ HINGLISH LANGUAGE PATTERNS:
             'pattern_markers': self._extract_applied_patterns(script_text)
         }
 
+    def _cap_words(self, text: str, word_count: int, max_words: int) -> Tuple[str, int]:
+        """Truncate text with a known word count to max_words; returns the text and its word count"""
+        if word_count <= max_words:
+            return text, word_count
+        trimmed = self._truncate_to_words_sentence_aware(text, max_words)
+        return trimmed, len(trimmed.split())
+
     def _truncate_to_words_sentence_aware(self, text: str, max_words: int) -> str:
         """Trim text to max_words, preferring to cut at sentence boundaries.
         Supports English (. ! ?) and Hindi danda (।) plus pipes often used as separators.
         """
-        words = text.split()
-        if len(words) <= max_words:
+        # Words and separators take at least one character each, so short texts cannot be over the cap
+        if (len(text) + 1) // 2 <= max_words:
+            return text
+        # Locate the end of the max_words-th word without splitting the whole text
+        words = _WORD_RE.finditer(text)
+        last_word = None
+        for last_word in islice(words, max_words):
+            pass
+        if last_word is None or next(words, None) is None:
             return text
-        # Build provisional trimmed text
-        provisional = " ".join(words[:max_words])
-        # Find last sentence boundary before cutoff
-        import re
-        # Include common sentence-ending punctuation
-        boundary_regex = re.compile(r"[\.\!\?\|\u0964]\s")  # \u0964 is '।'
+        # Build provisional trimmed text (original spacing and line breaks kept)
+        provisional = text[:last_word.end()]
+        # Find last sentence boundary before cutoff, scanning back from the end
         last_boundary_idx = -1
-        for match in boundary_regex.finditer(provisional):
-            last_boundary_idx = match.end()
+        for i in range(len(provisional) - 1, 0, -1):
+            if provisional[i].isspace() and provisional[i - 1] in _BOUNDARY_CHARS:
+                last_boundary_idx = i + 1
+                break
         if last_boundary_idx != -1:
             trimmed = provisional[:last_boundary_idx].strip()
         else:
@@ -840,25 +1414,25 @@ HINGLISH LANGUAGE PATTERNS:
 
     def _ensure_sentence_boundary(self, text: str) -> str:
         """Ensure the script ends at a clean sentence boundary without injecting canned text."""
-        import re
         cleaned = text.rstrip()
         # If not ending with sentence punctuation, add a period
-        if not re.search(r"[\.\!\?\u0964]$", cleaned):
+        if not cleaned or cleaned[-1] not in _END_CHARS:
             cleaned = cleaned + "."
         return cleaned
     
     def _create_timing_suggestions(self, target_minutes: int) -> Dict[str, str]:
         """Create timing suggestions for video production"""
-        total_seconds = target_minutes * 60
-        
-        return {
-            'hook_duration': '10-15 seconds',
-            'intro_duration': '15-20 seconds', 
-            'main_content_start': f'{25} seconds',
-            'cta_timing': f'{total_seconds - 30} seconds',
-            'outro_timing': f'{total_seconds - 15} seconds',
-            'total_target': f'{target_minutes} minutes'
-        }
+        # Copied because the dict ends up in the (mutable) result
+        return dict(_timing_suggestions(target_minutes))
+    
+    def _format_timing_markdown(self, timing_suggestions: Dict[str, str]) -> str:
+        """Format timing suggestions as the markdown list shown in the UI"""
+        return (
+            f"- **Hook:** {timing_suggestions['hook_duration']}\n"
+            f"- **Intro:** {timing_suggestions['intro_duration']}\n"
+            f"- **CTA:** Around {timing_suggestions['cta_timing']}\n"
+            f"- **Outro:** From {timing_suggestions['outro_timing']}"
+        )
     
     def _extract_applied_patterns(self, script: str) -> Dict[str, List[str]]:
         """Identify which creator patterns were applied in the script"""
@@ -869,48 +1443,77 @@ HINGLISH LANGUAGE PATTERNS:
             'transition_words': []
         }
         
-        script_lower = script.lower()
-        
-        # Check for common Hinglish expressions
-        hinglish_exprs = ['दोस्तों', 'भाई', 'यार', 'सुनिए', 'देखिए', 'तो यहाँ पर']
-        for expr in hinglish_exprs:
-            if expr in script_lower:
-                detected_patterns['hinglish_expressions'].append(expr)
+        # Check for common Hinglish expressions (one automaton pass when available)
+        if _PATTERN_AUTOMATON is not None:
+            found = {expr for _, expr in _PATTERN_AUTOMATON.iter(script)}
+            detected_patterns['hinglish_expressions'] = [expr for expr in _HINGLISH_EXPRESSIONS if expr in found]
+        else:
+            detected_patterns['hinglish_expressions'] = [expr for expr in _HINGLISH_EXPRESSIONS if expr in script]
         
-        # Check for engagement phrases
-        engagement_phrases = ['subscribe', 'like', 'notification', 'bell', 'comment', 'share']
-        for phrase in engagement_phrases:
-            if phrase in script_lower:
-                detected_patterns['engagement_phrases'].append(phrase)
+        # Check for engagement phrases, including inflected forms (see _ENGAGEMENT_RE)
+        found = {match.lower() for match in _ENGAGEMENT_RE.findall(script)}
+        detected_patterns['engagement_phrases'] = [phrase for phrase in _ENGAGEMENT_PHRASES if phrase in found]
         
         return detected_patterns
     
-    def save_training_context(self, filepath: str):
-        """Save training context to file for future use"""
+    def save_training_context(self, filepath: str, pretty: bool = False):
+        """Save training context to file for future use (compact JSON unless pretty)"""
         context_save_data = {
             'creator_styles': self.creator_styles,
             'training_context': self.training_context,
             'generation_config': self.generation_config
         }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(context_save_data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            # orjson serializes the dataclasses natively and is much faster than the json module
+            options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            if pretty:
+                options |= orjson.OPT_INDENT_2
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(context_save_data, default=_json_default, option=options))
+        else:
+            encoder = json.JSONEncoder(
+                ensure_ascii=False,
+                indent=2 if pretty else None,
+                separators=None if pretty else (',', ':'),
+                default=_json_default
+            )
+            # Written chunk by chunk rather than building the whole document in memory
+            with open(filepath, 'w', encoding='utf-8') as f:
+                for chunk in encoder.iterencode(context_save_data):
+                    f.write(chunk)
         
-        print(f"[OK] Training context saved to {filepath}")
+        log.info("Training context saved to %s", filepath)
     
     def load_training_context(self, filepath: str):
         """Load previously saved training context"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                context_data = json.load(f)
+            # Reuse the file's bytes while it is unchanged on disk (same mtime and size)
+            stat = os.stat(filepath)
+            key = (filepath, stat.st_mtime_ns, stat.st_size)
+            raw = ScriptGenerator._LOAD_CACHE.get(key)
+            if raw is None:
+                with open(filepath, 'rb') as f:
+                    raw = f.read()
+                # Drop any stale version of this file, then the oldest entries past the bound
+                for stale in [k for k in ScriptGenerator._LOAD_CACHE if k[0] == filepath]:
+                    del ScriptGenerator._LOAD_CACHE[stale]
+                while len(ScriptGenerator._LOAD_CACHE) >= ScriptGenerator._LOAD_CACHE_MAX_ENTRIES:
+                    del ScriptGenerator._LOAD_CACHE[next(iter(ScriptGenerator._LOAD_CACHE))]
+                ScriptGenerator._LOAD_CACHE[key] = raw
+            # Parsing is cheaper than deep-copying a cached parse and never shares objects
+            context_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
             
             self.creator_styles = context_data.get('creator_styles', {})
+            self._map_creator_blocks()
+            self._index_tone_profiles()
+            self._creator_context_cache.clear()
             self.training_context = context_data.get('training_context', {})
             
-            print(f"[OK] Training context loaded from {filepath}")
+            log.info("Training context loaded from %s", filepath)
             return True
             
         except Exception as e:
-            print(f"[ERROR] Error loading training context: {e}")
+            log.error("Error loading training context: %s", e)
             return False
 
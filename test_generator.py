@@ -6,6 +6,7 @@ Quick test to verify the system works with your data
 
 import os
 import json
+import logging
 from pathlib import Path
 
 # Import our modules
@@ -60,6 +61,69 @@ def test_transcript_loading():
         print(f"❌ Error loading transcripts: {e}")
         return None
 
+def test_engagement_detection():
+    """Test engagement phrase detection on inflected forms"""
+    print("\n🔔 Testing engagement phrase detection...")
+    
+    # Pattern detection needs no model, so skip the Gemini setup in __init__
+    generator = ScriptGenerator.__new__(ScriptGenerator)
+    script = ("Dosto, hamare subscribers ne yeh video liked kiya aur comments mein shared kiya. "
+              "Notifications on rakho, bells bajao. Yeh likely sabse accha phone hai.")
+    found = generator._extract_applied_patterns(script)['engagement_phrases']
+    expected = ['subscribe', 'like', 'notification', 'bell', 'comment', 'share']
+    if found != expected:
+        print(f"❌ Expected {expected}, got {found}")
+        return False
+    
+    found = generator._extract_applied_patterns("This is likely the best phone.")['engagement_phrases']
+    if found:
+        print(f"❌ 'likely' should not count as 'like', got {found}")
+        return False
+    
+    print("✅ Plural and past-tense engagement phrases detected")
+    return True
+
+def test_tone_creator_matching():
+    """Test which creator each selectable tone auto-selects"""
+    print("\n🎯 Testing tone-based creator selection...")
+    
+    # Tone matching needs no model, so skip the Gemini setup in __init__
+    generator = ScriptGenerator.__new__(ScriptGenerator)
+    generator.creator_styles = {
+        'Energetic Creator': {'tone_profile': {'enthusiasm': 6.0, 'technical_depth': 1.0, 'friendliness': 2.0}},
+        'Technical Creator': {'tone_profile': {'enthusiasm': 1.0, 'technical_depth': 6.0, 'friendliness': 2.0}},
+        'Friendly Creator': {'tone_profile': {'enthusiasm': 2.0, 'technical_depth': 1.0, 'friendliness': 6.0}},
+    }
+    generator._index_tone_profiles()
+    expected = {
+        'friendly_and_informative': 'Friendly Creator',
+        'enthusiastic_and_energetic': 'Energetic Creator',
+        'professional_and_formal': 'Technical Creator',
+        'casual_and_conversational': 'Friendly Creator',
+        'dramatic_and_engaging': 'Energetic Creator',
+        'technical_and_detailed': 'Technical Creator',
+        'humorous_and_entertaining': 'Energetic Creator',
+    }
+    
+    enabled = Config.AUTO_SELECT_CREATOR_BY_TONE
+    try:
+        Config.AUTO_SELECT_CREATOR_BY_TONE = True
+        selected = {tone: generator._auto_select_creator(tone) for tone in Config.VALID_TONES_ORDERED}
+        Config.AUTO_SELECT_CREATOR_BY_TONE = False
+        disabled = generator._auto_select_creator('friendly_and_informative')
+    finally:
+        Config.AUTO_SELECT_CREATOR_BY_TONE = enabled
+    
+    if selected != expected:
+        print(f"❌ Expected {expected}, got {selected}")
+        return False
+    if disabled is not None:
+        print(f"❌ Auto-select should add no creator when disabled, got {disabled}")
+        return False
+    
+    print("✅ Each tone selects the expected creator")
+    return True
+
 def test_script_generation(test_transcripts):
     """Test script generation capability"""
     print("\n🚀 Testing script generation...")
@@ -117,13 +181,23 @@ def run_tests():
         print("\n❌ Environment tests failed!")
         return False
     
-    # Test 2: Transcript loading
+    # Test 2: Engagement phrase detection
+    if not test_engagement_detection():
+        print("\n❌ Engagement detection tests failed!")
+        return False
+    
+    # Test 3: Tone-based creator selection
+    if not test_tone_creator_matching():
+        print("\n❌ Creator selection tests failed!")
+        return False
+    
+    # Test 4: Transcript loading
     transcripts = test_transcript_loading()
     if not transcripts:
         print("\n❌ Transcript loading tests failed!")
         return False
     
-    # Test 3: Script generation
+    # Test 5: Script generation
     if not test_script_generation(transcripts):
         print("\n❌ Script generation tests failed!")
         return False
@@ -137,6 +211,7 @@ def run_tests():
     return True
 
 if __name__ == "__main__":
+    logging.basicConfig(level=Config.LOG_LEVEL, format="%(levelname)s %(name)s: %(message)s")
     try:
         run_tests()
     except KeyboardInterrupt:
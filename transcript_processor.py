@@ -5,6 +5,10 @@ Handles loading, preprocessing, and analysis of YouTube transcripts
 
 import json
 import os
+try:
+    import orjson as _json
+except ImportError:  # orjson is optional; the stdlib parser is the fallback
+    _json = json
 import pandas as pd
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
@@ -86,8 +90,7 @@ class TranscriptProcessor:
     def load_single_transcript(self, file_path: Path) -> Optional[ProcessedTranscript]:
         """Load and process a single transcript file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _json.loads(file_path.read_bytes())
             
             # Extract metadata
             metadata = self._extract_metadata(data)